@@ -0,0 +1,80 @@
+"""Scale the number of concurrently rendered figures to the available memory."""
+# Standard library
+import gc
+import threading
+
+# Third-party
+import psutil
+
+MIB = 1024**2
+
+
+class MemoryLimiter:
+    """Admit jobs only while the memory stays within a budget.
+
+    Starting with one job, the number of concurrent jobs is increased by one
+    whenever a job finishes and the memory of the process (resident set size)
+    plus the memory of one more job fits into the budget, while the node keeps
+    a reserve of free memory. If the budget or the reserve is exceeded, no new
+    jobs are admitted until enough running jobs have finished. A single job
+    is always admitted, such that the run makes progress.
+
+    Args:
+        max_workers (int): upper limit of concurrent jobs
+        budget_mb (float): memory budget of the process in MiB; no budget
+            apart from the node reserve if None
+        reserve_fraction (float): fraction of the node memory to keep free
+        poll_seconds (float): interval to re-check the memory while waiting
+
+    """
+
+    def __init__(
+        self, max_workers, budget_mb=None, reserve_fraction=0.1, poll_seconds=0.5
+    ):
+        self.max_workers = max_workers
+        self.budget = budget_mb * MIB if budget_mb else None
+        self.reserve = psutil.virtual_memory().total * reserve_fraction
+        self.poll_seconds = poll_seconds
+        self.limit = 1
+        self.running = 0
+        self.peak_running = 0
+        self._process = psutil.Process()
+        self._baseline = self._process.memory_info().rss
+        # largest memory observed per running job
+        self._job_memory = 0.0
+        self._condition = threading.Condition()
+
+    def _fits(self, additional_jobs):
+        rss = self._process.memory_info().rss
+        if self.running:
+            self._job_memory = max(
+                self._job_memory, (rss - self._baseline) / self.running
+            )
+        needed = additional_jobs * self._job_memory
+        if self.budget is not None and rss + needed > self.budget:
+            return False
+        return psutil.virtual_memory().available - needed > self.reserve
+
+    def acquire(self):
+        """Block until a new job may start."""
+        with self._condition:
+            while self.running and not (
+                self.running < self.limit and self._fits(additional_jobs=1)
+            ):
+                if not self._fits(additional_jobs=0):
+                    # scale down, until the running jobs fit again
+                    self.limit = max(1, self.running - 1)
+                    gc.collect()
+                self._condition.wait(self.poll_seconds)
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+
+    def release(self):
+        """Mark a job as finished, and scale up if another job fits."""
+        with self._condition:
+            self.running -= 1
+            if self.limit < self.max_workers and self._fits(
+                additional_jobs=self.limit - self.running + 1
+            ):
+                self.limit += 1
+            self._condition.notify()
@@ -0,0 +1,128 @@
+"""Run several plotting jobs of a batch file in one process.
+
+A batch file (YAML or JSON) lists runs with the options of the command line
+interface, optionally with defaults shared by all runs:
+
+    defaults:
+      input_dir: /scratch/osm/movero/wd/2022s4
+      workers: 8
+    runs:
+      - model_versions: C-1E-CTR_ch,C-1E_ch
+        plot_type: station,time
+        output_dir: plots/ch
+      - model_versions: C-2E_ch
+        plot_type: ensemble
+        output_dir: plots/ens
+
+A list of runs without defaults is accepted as well. The runs share the
+process, i.e. its cache of loaded input files, the map backgrounds and the
+pool of worker threads.
+"""
+# Standard library
+import copy
+import json
+import traceback
+from pathlib import Path
+
+# Third-party
+import click
+import yaml
+
+# options which are not passed to a run of a batch
+_PROCESS_OPTIONS = ("daemon", "socket_path", "no_daemon", "batch")
+
+
+def load_batch_file(path) -> list:
+    """Read the runs of a batch file, with the defaults applied.
+
+    Returns:
+        list: options (dict) of each run
+
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8") as file:
+        if path.suffix == ".json":
+            batch = json.load(file)
+        else:
+            batch = yaml.safe_load(file)
+    if isinstance(batch, list):
+        batch = {"runs": batch}
+    if not isinstance(batch, dict) or not isinstance(batch.get("runs"), list):
+        raise click.BadParameter(
+            f"{path} is neither a list of runs nor a mapping with 'runs'."
+        )
+    defaults = batch.get("defaults") or {}
+    return [{**defaults, **(run or {})} for run in batch["runs"]]
+
+
+def _run_argv(command, options) -> list:
+    """Translate the options of a run to command line arguments."""
+    params = {param.name: param for param in command.params}
+    argv = []
+    for key, value in options.items():
+        name = key.replace("-", "_")
+        if name not in params or name in _PROCESS_OPTIONS:
+            raise click.BadParameter(f"Unknown option {key!r} in batch run.")
+        param = params[name]
+        if isinstance(param, click.Argument):
+            argv.append(_option_value(value))
+        elif param.is_flag:
+            if value:
+                argv.append(param.opts[0])
+        elif param.multiple:
+            for item in value if isinstance(value, list) else [value]:
+                argv.extend([param.opts[0], _option_value(item)])
+        elif value is not None:
+            argv.extend([param.opts[0], _option_value(value)])
+    return argv
+
+
+def _option_value(value) -> str:
+    if isinstance(value, list):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def run_batch(command, batch_file) -> int:
+    """Run all runs of the batch file, continuing after failed runs.
+
+    Args:
+        command (click.Command): the command line interface, which parses
+            and validates the options of each run
+        batch_file (str): YAML or JSON file of the runs
+
+    Returns:
+        int: 0 if all runs succeeded, 1 otherwise
+
+    """
+    # Local
+    from .config import plot_settings  # pylint: disable=import-outside-toplevel
+    from .main import main  # pylint: disable=import-outside-toplevel
+
+    runs = load_batch_file(batch_file)
+    # parse all runs first, such that a typo does not abort the batch midway
+    contexts = [
+        command.make_context("moveroplot", _run_argv(command, options))
+        for options in runs
+    ]
+    modelcolors = copy.deepcopy(plot_settings.modelcolors)
+    failed = []
+    for index, run_ctx in enumerate(contexts, start=1):
+        print(f"--- batch run {index}/{len(contexts)}")
+        # reset the settings modified by the options of the previous run
+        plot_settings.modelcolors = copy.deepcopy(modelcolors)
+        params = {
+            key: value
+            for key, value in run_ctx.params.items()
+            if key not in _PROCESS_OPTIONS
+        }
+        try:
+            with run_ctx:
+                main(run_ctx, **params)
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc()
+            failed.append(index)
+    if failed:
+        print(f"--- batch runs failed: {', '.join(map(str, failed))}")
+        return 1
+    return 0
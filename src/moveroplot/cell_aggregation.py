@@ -0,0 +1,93 @@
+"""Aggregate the scores of dense station networks into map cells.
+
+Instead of a marker per station, the stations are binned into hexagons or
+the squares of a regular grid covering the map, and each cell shows the
+mean score of its stations. The means are weighted by the number of
+observations of the stations, if known. Cells are computed in the (map)
+coordinates of the stations, at once for all stations, and drawn as one
+collection of polygons. Thus the cost of drawing a map depends on the
+number of cells instead of the number of stations.
+"""
+# Third-party
+import numpy as np
+
+AGGREGATION_SHAPES = ("hexbin", "grid")
+
+# corners of a hexagon of width 1 (pointy top), relative to its center
+_HEXAGON = np.array(
+    [[0.5, -0.5], [0.5, 0.5], [0.0, 1.0], [-0.5, 0.5], [-0.5, -0.5], [0.0, -1.0]]
+) * [1.0, 1.0 / np.sqrt(3)]
+# corners of a square of width 1, relative to its center
+_SQUARE = np.array([[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]])
+
+
+def _hexagon_cells(x, y, x0, y0, width):
+    """Centers of the hexagons containing the points.
+
+    The hexagons are centered on two rectangular lattices, offset by half a
+    cell; each point belongs to the nearer of the two lattice points.
+    """
+    height = width * np.sqrt(3)
+    ix, iy = (x - x0) / width, (y - y0) / height
+    ix1, iy1 = np.round(ix), np.round(iy)
+    ix2, iy2 = np.floor(ix) + 0.5, np.floor(iy) + 0.5
+    first = (ix - ix1) ** 2 + 3 * (iy - iy1) ** 2 <= (ix - ix2) ** 2 + 3 * (
+        iy - iy2
+    ) ** 2
+    return (
+        x0 + np.where(first, ix1, ix2) * width,
+        y0 + np.where(first, iy1, iy2) * height,
+    )
+
+
+def _square_cells(x, y, x0, y0, width):
+    """Centers of the squares of the grid containing the points."""
+    return (
+        x0 + (np.floor((x - x0) / width) + 0.5) * width,
+        y0 + (np.floor((y - y0) / width) + 0.5) * width,
+    )
+
+
+def aggregate_stations(x, y, values, extent, cells, shape="hexbin", weights=None):
+    """Aggregate the values of stations into the cells covering an extent.
+
+    Args:
+        x (np.ndarray): x coordinates of the stations (with values)
+        y (np.ndarray): y coordinates of the stations
+        values (np.ndarray): values of the stations
+        extent (tuple): x0, x1, y0, y1 of the area covered by the cells
+        cells (int): number of cells across the width of the extent
+        shape (str): hexbin or grid
+        weights (np.ndarray): weights of the stations (i.e. their number of
+            observations), cells w/o positive weights are not weighted
+
+    Returns:
+        tuple: polygons (cells, corners, 2) and mean value of each cell with
+        stations
+
+    """
+    if shape not in AGGREGATION_SHAPES:
+        raise ValueError(
+            f"Unknown aggregation {shape!r}. Choose from {list(AGGREGATION_SHAPES)}."
+        )
+    x0, x1, y0, y1 = extent
+    # stations on a vertical line are aggregated into cells of width 1
+    width = abs(x1 - x0) / cells or 1.0
+    if shape == "hexbin":
+        center_x, center_y = _hexagon_cells(x, y, min(x0, x1), min(y0, y1), width)
+        polygon = _HEXAGON * width
+    else:
+        center_x, center_y = _square_cells(x, y, min(x0, x1), min(y0, y1), width)
+        polygon = _SQUARE * width
+    centers, cell = np.unique(
+        np.column_stack([center_x, center_y]), axis=0, return_inverse=True
+    )
+    cell = cell.ravel()
+    count = np.bincount(cell, minlength=len(centers))
+    means = np.bincount(cell, values, minlength=len(centers)) / np.maximum(count, 1)
+    if weights is not None:
+        weights = np.where(np.isfinite(weights) & (weights > 0), weights, 0.0)
+        total = np.bincount(cell, weights, minlength=len(centers))
+        weighted = np.bincount(cell, values * weights, minlength=len(centers))
+        means = np.where(total > 0, weighted / np.where(total > 0, total, 1), means)
+    return centers[:, np.newaxis, :] + polygon, means
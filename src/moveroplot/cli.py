@@ -8,7 +8,41 @@ from click import Context
 
 # Local
 from . import __version__
-from .main import main
+from .batch import run_batch
+from .daemon import default_socket_path
+from .daemon import runs_locally
+from .daemon import serve
+from .daemon import submit
+
+
+def _run_batch(ctx: Context, _param, batch_file) -> None:
+    # run before the other options are validated, which the runs set
+    if batch_file is None or ctx.resilient_parsing:
+        return
+    ctx.exit(run_batch(ctx.command, batch_file))
+
+
+def _serve_daemon(ctx: Context, param, value):
+    # run before the other options are validated, i.e. w/o any input directory
+    if ctx.resilient_parsing:
+        return value
+    ctx.meta[f"moveroplot.{param.name}"] = value
+    if ctx.meta.get("moveroplot.daemon") and "moveroplot.socket_path" in ctx.meta:
+        serve(ctx.meta["moveroplot.socket_path"] or default_socket_path())
+        ctx.exit()
+    return value
+
+
+def _prepare_features(ctx: Context, _param, prepare) -> None:
+    if not prepare or ctx.resilient_parsing:
+        return
+    # Local
+    from .station_scores import (  # pylint: disable=import-outside-toplevel
+        prepare_map_features,
+    )
+
+    prepare_map_features()
+    ctx.exit()
 
 
 @click.option(
@@ -98,8 +132,217 @@ from .main import main
     using matploblib's color coding""",
 )
 @click.option("--grid", type=bool, is_flag=True, help="Add grid to plots.")
-@click.option("--topography", type=str, help="Specify the topography file path to add relief to maps.")
+@click.option(
+    "--topography",
+    type=str,
+    help="Specify the topography file path to add relief to maps.",
+)
+@click.option(
+    "--domain",
+    type=str,
+    help="""Map domain of the station maps (i.e. ch, alps, or one of
+    ~/.config/moveroplot/domains.yaml). Def: derived from the model version""",
+)
+@click.option(
+    "--bbox",
+    type=str,
+    help="""Only draw the stations in the box lon_min,lon_max,lat_min,lat_max
+    on station maps of the box (i.e. 8.5,10.6,46.9,47.8)""",
+)
+@click.option(
+    "--region",
+    type=str,
+    help="""Only draw the stations of a region of
+    ~/.config/moveroplot/regions.yaml on station maps of the region""",
+)
+@click.option(
+    "--station_map",
+    type=click.Choice(["stations", "hexbin", "grid"]),
+    default="stations",
+    help="""Draw the stations of station maps, or aggregate them into
+    hexagons or grid cells (for dense station networks). Def: stations""",
+)
+@click.option(
+    "--station_cells",
+    type=click.IntRange(min=1),
+    default=40,
+    help="Number of cells across a station map (see --station_map). Def: 40",
+)
+@click.option(
+    "--station_layout",
+    type=click.Choice(["scores", "lead_times"]),
+    default="scores",
+    help="""Station map figures per lead time range, or with the maps of all
+    lead time ranges on a shared colour scale (lead_times). Def: scores""",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of threads used to render figures. Def: 1",
+)
+@click.option(
+    "--dry_run",
+    "--dry-run",
+    "dry_run",
+    type=bool,
+    is_flag=True,
+    help="Only compile the figure plan; print it as JSON with counts per plot type.",
+)
+@click.option(
+    "--plan_file",
+    type=str,
+    help="Write the figure plan as JSON to this file.",
+)
+@click.option(
+    "--watch",
+    type=bool,
+    is_flag=True,
+    help="""After rendering, keep polling the input files and re-render the
+    figures depending on changed files. The first rendering skips the figures
+    which are up to date only with --resume.""",
+)
+@click.option(
+    "--poll_seconds",
+    type=click.FloatRange(min=0, min_open=True),
+    default=30,
+    help="Interval between two scans of the input files by --watch. Def: 30",
+)
+@click.option(
+    "--serve_http",
+    type=click.IntRange(min=0, max=65535),
+    help="""Serve the figures on this port of localhost, rendered on first
+    request and cached (i.e. http://127.0.0.1:<port>/ lists all figures).""",
+)
+@click.option(
+    "--cache_dir",
+    type=str,
+    help="Disk cache of --serve_http. Def: ~/.cache/moveroplot/figures",
+)
+@click.option(
+    "--cache_mb",
+    type=click.FloatRange(min=0),
+    default=256,
+    help="Size (MiB) of the memory cache of --serve_http. Def: 256",
+)
+@click.option(
+    "--disk_cache_mb",
+    type=click.FloatRange(min=0),
+    default=2048,
+    help="Size (MiB) of the disk cache of --serve_http. Def: 2048",
+)
+@click.option(
+    "--daemon",
+    type=bool,
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=_serve_daemon,
+    help="""Run as daemon, which keeps the imports and caches warm and renders
+    the jobs submitted by moveroplot calls on the --socket.""",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=str,
+    is_eager=True,
+    callback=_serve_daemon,
+    help="""Unix socket of the daemon. Def: $XDG_RUNTIME_DIR/moveroplot-<uid>.sock""",
+)
+@click.option(
+    "--no_daemon",
+    type=bool,
+    is_flag=True,
+    help="Run locally, even if a daemon is running.",
+)
+@click.option(
+    "--batch",
+    type=click.Path(exists=True, dir_okay=False),
+    is_eager=True,
+    expose_value=False,
+    callback=_run_batch,
+    help="""Run all runs of this YAML or JSON file in one process, which
+    shares the loaded files, map backgrounds and workers between the runs.
+    The runs take the options of the command line (see README).""",
+)
+@click.option(
+    "--prepare_features",
+    type=bool,
+    is_flag=True,
+    is_eager=True,
+    expose_value=False,
+    callback=_prepare_features,
+    help="""Clip, project and simplify the geographic features of the map
+    domains once and store them in ~/.cache/moveroplot/features, which the
+    maps are drawn from (i.e. on nodes without network access).""",
+)
+@click.option(
+    "--only",
+    type=str,
+    multiple=True,
+    help="""Only render the figures whose output name matches this glob pattern
+    (i.e. 'station_scores_T_2M_19-24*'). Can be given several times or as a
+    comma separated list. All input files of the parameters and lead time
+    ranges of these figures are read, as the period in their titles depends
+    on all of them.""",
+)
+@click.option(
+    "--shard",
+    type=str,
+    help="""Only render shard i of N (i.e. 2/4) of all figures. The shards are
+    disjoint and balanced, i.e. to be used in a job array.""",
+)
+@click.option(
+    "--queue_dir",
+    type=str,
+    help="""Claim figures from a work queue in this directory, shared by any
+    number of moveroplot workers (i.e. on different nodes).""",
+)
+@click.option(
+    "--lease_seconds",
+    type=click.FloatRange(min=1),
+    default=300,
+    help="Reclaim figures of workers which did not renew their lease within "
+    "this time. Def: 300",
+)
+@click.option(
+    "--cost_file",
+    type=str,
+    help="""File recording the runtime of each figure, used to render the
+    longest figures first. Def: ~/.cache/moveroplot/figure_runtimes.jsonl""",
+)
+@click.option(
+    "--memory_budget",
+    type=click.FloatRange(min=0, min_open=True),
+    help="""Memory budget (MiB) of the process. With several --workers, new
+    figures are only started while the memory stays within the budget and
+    10% of the node memory is free.""",
+)
+@click.option(
+    "--resume",
+    "--incremental",
+    "resume",
+    type=bool,
+    is_flag=True,
+    help="""Only render figures which are missing or incomplete in the output
+    directory, or whose input files, settings or moveroplot version changed
+    since they were rendered.""",
+)
 @click.pass_context
-def cli(ctx: Context, **kwargs) -> None:
+def cli(
+    ctx: Context,
+    socket_path: str,
+    no_daemon: bool,
+    **kwargs,
+) -> None:
     """Console script for test_cli_project."""
+    socket_path = socket_path or default_socket_path()
+    # jobs which keep running (--watch, --serve_http) would block the daemon
+    if not no_daemon and not runs_locally(kwargs):
+        exit_code = submit(socket_path, kwargs)
+        if exit_code is not None:
+            ctx.exit(exit_code)
+    # Local
+    from .main import main  # pylint: disable=import-outside-toplevel
+
     main(ctx, **kwargs)
@@ -0,0 +1,30 @@
+"""Map domains of the station score maps (see moveroplot.domains).
+
+More domains can be added in $XDG_CONFIG_HOME/moveroplot/domains.yaml.
+"""
+
+domains: dict = {
+    "ch": {
+        "extent": [5.8, 10.6, 45.75, 47.8],
+        "models": ["ch"],
+    },
+    "alps": {
+        "extent": [0.7, 16.5, 42.3, 50],
+        "models": ["alps"],
+    },
+}
+
+# settings of domains which do not define them
+domain_defaults: dict = {
+    # cartopy projection (name of the class) and its arguments
+    "projection": {
+        "name": "RotatedPole",
+        "pole_longitude": -170,
+        "pole_latitude": 43,
+    },
+    # size (inches) and resolution of one map
+    "panel_size": [7.3, 5],
+    "dpi": 100,
+    # parts of model versions which select the domain
+    "models": [],
+}
@@ -0,0 +1,183 @@
+"""Predict the rendering time of figures from the runtimes of previous runs.
+
+The runtime of every rendered figure is appended to a local JSON lines file,
+together with its kind and features. Per kind, the runtime is fitted
+linearly to the features; kinds with too few records fall back to their
+mean runtime or to a default per plot type. The predictions are used to
+render the most expensive figures first, which shortens the makespan of
+parallel runs.
+"""
+# Standard library
+import heapq
+import json
+import os
+from collections import defaultdict
+from pathlib import Path
+
+# Third-party
+import numpy as np
+
+FEATURES = ("panels", "models", "input_kb")
+# rough runtimes (s) of plot types, before any runtime has been recorded
+DEFAULT_SECONDS = {
+    "station": 4.0,
+    "time": 1.5,
+    "daytime": 1.0,
+    "total": 1.0,
+    "ensemble": 1.0,
+}
+# most recent records per kind used to fit the model
+MAX_RECORDS = 200
+
+
+def default_cost_file() -> Path:
+    cache_dir = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_dir) / "moveroplot" / "figure_runtimes.jsonl"
+
+
+def figure_kind(spec) -> str:
+    """Group figures drawn by the same code path, i.e. station+topo."""
+    kind = spec["plot_type"]
+    if spec["style"].get("kind"):
+        kind += f":{spec['style']['kind']}"
+    if spec["style"].get("topography"):
+        kind += "+topo"
+    return kind
+
+
+def figure_features(spec, input_dir) -> dict:
+    """Features of a figure, known before its inputs are read.
+
+    The size of the input files stands in for the number of stations and
+    data points.
+    """
+    input_bytes = 0
+    for file in spec["inputs"]:
+        try:
+            input_bytes += (Path(input_dir) / file).stat().st_size
+        except OSError:
+            pass
+    return {
+        "panels": len(spec["panels"]),
+        "models": len(spec["models"]),
+        "input_kb": input_bytes / 1024,
+    }
+
+
+def load_runtimes(cost_file) -> list:
+    """Read the recorded runtimes, skipping unreadable lines."""
+    records: list = []
+    try:
+        with open(cost_file, encoding="utf-8") as lines:
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return records
+
+
+def record_runtimes(cost_file, records):
+    """Append runtime records ({"kind", "seconds", <features>}) to the file."""
+    try:
+        Path(cost_file).parent.mkdir(parents=True, exist_ok=True)
+        with open(cost_file, "a", encoding="utf-8") as lines:
+            for record in records:
+                lines.write(json.dumps(record) + "\n")
+    except OSError as error:
+        print(f"Could not record the figure runtimes: {error}")
+
+
+def fit_cost_model(records) -> dict:
+    """Fit the runtime of each kind of figure.
+
+    Returns:
+        dict: kind -> coefficients of (1, *FEATURES), the mean runtime is
+        used if there are less records than coefficients
+
+    """
+    by_kind = defaultdict(list)
+    for record in records:
+        by_kind[record["kind"]].append(record)
+    model = {}
+    for kind, kind_records in by_kind.items():
+        kind_records = kind_records[-MAX_RECORDS:]
+        seconds = np.array([record["seconds"] for record in kind_records])
+        if len(kind_records) <= len(FEATURES):
+            model[kind] = [float(seconds.mean())] + [0.0] * len(FEATURES)
+            continue
+        features = np.array(
+            [[1.0] + [record[name] for name in FEATURES] for record in kind_records]
+        )
+        coefficients, *_ = np.linalg.lstsq(features, seconds, rcond=None)
+        model[kind] = [float(value) for value in coefficients]
+    return model
+
+
+def predict(model, kind, features) -> float:
+    if kind not in model:
+        return DEFAULT_SECONDS.get(kind.split(":")[0].split("+")[0], 1.0)
+    intercept, *weights = model[kind]
+    seconds = intercept + sum(
+        weight * features[name] for weight, name in zip(weights, FEATURES)
+    )
+    # a linear fit may extrapolate below zero for tiny figures
+    return max(seconds, 0.01)
+
+
+def predict_costs(figures, input_dir, cost_file) -> dict:
+    """Predict the runtime of each figure.
+
+    Returns:
+        dict: output name -> predicted seconds
+
+    """
+    model = fit_cost_model(load_runtimes(cost_file))
+    return {
+        spec["output"]: predict(
+            model, figure_kind(spec), figure_features(spec, input_dir)
+        )
+        for spec in figures
+    }
+
+
+def longest_first(figures, costs) -> list:
+    """Order the figures by decreasing predicted runtime (stable)."""
+    return sorted(figures, key=lambda spec: -costs[spec["output"]])
+
+
+def makespan(costs, workers=1) -> float:
+    """Duration of running jobs in the given order on a pool of workers."""
+    loads = [0.0] * workers
+    for cost in costs:
+        heapq.heapreplace(loads, loads[0] + cost)
+    return max(loads)
+
+
+def run_report(figures, costs, runtimes, workers, actual_makespan) -> str:
+    """Compare the predicted and actual runtimes of a run."""
+    lines = [f"--- run report ({len(runtimes)} figures, {workers} workers)"]
+    by_kind = defaultdict(lambda: [0, 0.0, 0.0])
+    for spec in figures:
+        if spec["output"] not in runtimes:
+            continue
+        totals = by_kind[figure_kind(spec)]
+        totals[0] += 1
+        totals[1] += costs[spec["output"]]
+        totals[2] += runtimes[spec["output"]]
+    for kind, (count, predicted, actual) in sorted(by_kind.items()):
+        lines.append(
+            f"{kind:>20}: {count:4d} figures, "
+            f"predicted {predicted:8.1f}s, actual {actual:8.1f}s"
+        )
+    predicted_makespan = makespan(
+        [costs[spec["output"]] for spec in figures if spec["output"] in runtimes],
+        workers,
+    )
+    lines.append(
+        f"{'makespan':>20}: predicted {predicted_makespan:.1f}s, "
+        f"actual {actual_makespan:.1f}s"
+    )
+    return "\n".join(lines)
@@ -0,0 +1,179 @@
+"""Run plotting jobs in a long-running process listening on a Unix socket.
+
+The daemon imports the plotting modules once and keeps their caches (i.e.
+the map backgrounds) warm across jobs. A job consists of the options of the
+command line interface, sent as one JSON line. The output of the job is
+streamed back, followed by a NUL byte and its exit code.
+
+Only the standard library is imported here, such that submitting a job
+stays cheap.
+"""
+# Standard library
+import copy
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import traceback
+from contextlib import redirect_stderr
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# options of the command line interface which hold paths
+PATH_OPTIONS = (
+    "input_dir",
+    "output_dir",
+    "topography",
+    "plan_file",
+    "cost_file",
+    "queue_dir",
+    "cache_dir",
+)
+# options of jobs which do not complete (i.e. keep serving), they hold the
+# daemon forever and are run by the client itself
+LOCAL_OPTIONS = ("watch", "serve_http")
+
+
+def runs_locally(options) -> bool:
+    """Check whether a job is run by the client instead of the daemon."""
+    return any(options.get(key) not in (None, False) for key in LOCAL_OPTIONS)
+
+
+def default_socket_path() -> Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir())
+    return Path(runtime_dir) / f"moveroplot-{os.getuid()}.sock"
+
+
+def _absolute_paths(options) -> dict:
+    """Resolve paths relative to the working directory of the client."""
+    return {
+        key: str(Path(value).absolute())
+        if key in PATH_OPTIONS and value is not None
+        else value
+        for key, value in options.items()
+    }
+
+
+def submit(socket_path, options):
+    """Run a job on the daemon, if one is listening on the socket.
+
+    Returns:
+        int: exit code of the job, or None if no daemon is running
+
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path))
+    except OSError:
+        client.close()
+        return None
+    with client, client.makefile("rwb") as stream:
+        job = json.dumps(_absolute_paths(options), default=str)
+        stream.write(job.encode() + b"\n")
+        stream.flush()
+        exit_code = None
+        while chunk := stream.read1(65536):
+            if exit_code is not None:
+                exit_code += chunk
+                continue
+            output, delimiter, rest = chunk.partition(b"\0")
+            sys.stdout.buffer.write(output)
+            sys.stdout.flush()
+            if delimiter:
+                exit_code = rest
+    # a daemon stopped during the job leaves no exit code
+    return int(exit_code) if exit_code else 1
+
+
+class _JobHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # Local
+        from .config import plot_settings
+        from .main import main
+
+        job = self.rfile.readline()
+        if not job:
+            # connection only checks whether the daemon is running
+            return
+        options = json.loads(job)
+        output = _SocketWriter(self.wfile)
+        if runs_locally(options):
+            output.write(
+                f"Jobs with {' or '.join(LOCAL_OPTIONS)} are not run by the daemon.\n"
+            )
+            self.wfile.write(b"\0" + b"1")
+            return
+        exit_code = 0
+        # reset the settings modified by the options of the previous job
+        plot_settings.modelcolors = copy.deepcopy(self.server.modelcolors)
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                main(None, **options)
+            except Exception:  # pylint: disable=broad-except
+                traceback.print_exc()
+                exit_code = 1
+        self.wfile.write(f"\0{exit_code}".encode())
+
+
+class _SocketWriter:
+    """Text stream writing to the client of a job."""
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, text):
+        try:
+            self.wfile.write(text.replace("\0", "").encode())
+        except OSError:
+            # the client is gone, the job still completes
+            pass
+        return len(text)
+
+    def flush(self):
+        try:
+            self.wfile.flush()
+        except OSError:
+            pass
+
+
+def serve(socket_path):
+    """Serve plotting jobs on the socket, one after the other.
+
+    Jobs are not run concurrently, as their output is redirected from the
+    standard streams of the daemon.
+    """
+    # Local
+    from .config import plot_settings
+    from .main import main  # noqa: F401  # pylint: disable=unused-import
+
+    socket_path = Path(socket_path)
+    if is_running(socket_path):
+        raise RuntimeError(f"A moveroplot daemon is running on {socket_path}.")
+    socket_path.unlink(missing_ok=True)
+    with socketserver.UnixStreamServer(str(socket_path), _JobHandler) as server:
+        server.modelcolors = copy.deepcopy(plot_settings.modelcolors)
+        print(f"--- moveroplot daemon listening on {socket_path}")
+        if threading.current_thread() is threading.main_thread():
+            # stop like on Ctrl-C, i.e. when the batch job is cancelled
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+def is_running(socket_path) -> bool:
+    """Check whether a daemon accepts connections on the socket."""
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with client:
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
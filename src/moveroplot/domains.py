@@ -0,0 +1,111 @@
+"""Registry of the map domains of station score maps.
+
+A domain defines the extent and projection of the maps and the size of one
+map in pixels, which in turn determine its map background. The built-in
+domains (see config/domains.py) are extended or overridden by the domains of
+the configuration file $XDG_CONFIG_HOME/moveroplot/domains.yaml, i.e.
+
+    alps_north:
+      extent: [5.5, 13.5, 46.0, 48.5]
+      models: [alps_north]
+
+A domain is either selected explicitly (--domain) or derived from the model
+versions: the last domain whose ``models`` occur in the model version name
+is used. Model versions without a domain need --domain.
+"""
+# Standard library
+import copy
+import functools
+import json
+import os
+from pathlib import Path
+
+# Third-party
+import cartopy.crs as ccrs
+import yaml
+
+# First-party
+from moveroplot.config import domains as domain_settings
+
+
+def default_domains_file() -> Path:
+    config_dir = os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")
+    return Path(config_dir) / "moveroplot" / "domains.yaml"
+
+
+def load_domains(domains_file=None) -> dict:
+    """Load the built-in and configured domains.
+
+    Args:
+        domains_file (str): YAML file of domains, defaults to
+            $XDG_CONFIG_HOME/moveroplot/domains.yaml (if it exists)
+
+    Returns:
+        dict: name -> domain (with all settings, incl. its name)
+
+    """
+    definitions = copy.deepcopy(domain_settings.domains)
+    domains_file = Path(domains_file or default_domains_file())
+    if domains_file.exists():
+        with open(domains_file, encoding="utf-8") as file:
+            configured = yaml.safe_load(file) or {}
+        if not isinstance(configured, dict):
+            raise ValueError(f"{domains_file} is not a mapping of domains.")
+        definitions.update(configured)
+    domains = {}
+    for name, definition in definitions.items():
+        domain = {**copy.deepcopy(domain_settings.domain_defaults), **definition}
+        if len(domain.get("extent") or []) != 4:
+            raise ValueError(
+                f"Domain {name!r} needs an extent [lon_min, lon_max, lat_min, lat_max]."
+            )
+        domains[name] = {"name": name, **domain}
+    return domains
+
+
+def select_domain(domains, model_version, name=None):
+    """Select the domain by name, or derive it from the model version.
+
+    Args:
+        domains (dict): domains of the registry (see load_domains)
+        model_version (str): model version of the maps
+        name (str): name of the domain, derived from the model version if None
+
+    Returns:
+        dict: the domain
+
+    Raises:
+        ValueError: if the domain is unknown, or none matches the model version
+
+    """
+    if name is not None:
+        if name not in domains:
+            raise ValueError(f"Unknown domain {name!r}. Choose from {list(domains)}.")
+        return domains[name]
+    selected = None
+    for domain in domains.values():
+        if any(part in model_version for part in domain["models"]):
+            selected = domain
+    if selected is None:
+        raise ValueError(
+            f"No map domain matches the model version {model_version!r}. Select "
+            f"one with --domain (from {list(domains)}) or add one to "
+            f"{default_domains_file()}."
+        )
+    return selected
+
+
+def domain_projection(domain):
+    """Projection of the domain, created once per definition."""
+    return _projection(json.dumps(domain["projection"], sort_keys=True))
+
+
+@functools.lru_cache(maxsize=None)
+def _projection(definition):
+    arguments = json.loads(definition)
+    return getattr(ccrs, arguments.pop("name"))(**arguments)
+
+
+def domain_size_px(domain) -> tuple:
+    """Size of one map of the domain in pixels."""
+    return tuple(size * domain["dpi"] for size in domain["panel_size"])
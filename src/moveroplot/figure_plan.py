@@ -0,0 +1,361 @@
+"""Compile the plot setup into an explicit plan of figures and execute it.
+
+The plan is a list of figure specifications (see ``plotting.figure_spec``).
+It is compiled from the parsed user input and the names of the input files
+only, i.e. before any file is read. Rendering then just executes the plan.
+"""
+# Standard library
+import fnmatch
+import json
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+# Local
+from . import daytime_scores
+from . import ensemble_scores
+from . import station_scores
+from . import time_scores
+from . import total_scores
+from .autoscale import MemoryLimiter
+from .cost_model import default_cost_file
+from .cost_model import figure_features
+from .cost_model import figure_kind
+from .cost_model import longest_first
+from .cost_model import predict_costs
+from .cost_model import record_runtimes
+from .cost_model import run_report
+from .journal import completed_figures
+from .journal import figure_fingerprints
+from .journal import journal_writer
+from .load_files import load_input_files
+from .plotting import run_jobs
+from .work_queue import LEASE_SECONDS
+from .work_queue import run_worker
+
+# plot type: (module, transformation of the loaded data, lt range as outer key)
+PLOT_TYPES = {
+    "station": (station_scores, station_scores._station_score_transformation, True),
+    "time": (time_scores, time_scores._time_score_transformation, True),
+    "daytime": (daytime_scores, daytime_scores._daytime_score_transformation, True),
+    "total": (total_scores, total_scores._total_score_transformation, False),
+    "ensemble": (
+        ensemble_scores,
+        ensemble_scores._ensemble_score_transformation,
+        True,
+    ),
+}
+
+
+def parse_plot_types(plot_type: str) -> list:
+    """Split the --plot_type input into the known plot types (in plotting order)."""
+    requested = {p_type.strip() for p_type in plot_type.split(",")}
+    unknown = requested - set(PLOT_TYPES)
+    if unknown:
+        raise ValueError(
+            f"Unknown plot type(s) {sorted(unknown)}. "
+            f"Choose from {list(PLOT_TYPES)}."
+        )
+    return [p_type for p_type in PLOT_TYPES if p_type in requested]
+
+
+def compile_plan(
+    plot_setup,
+    plot_types,
+    lt_ranges,
+    input_dir,
+    topography=None,
+    domain=None,
+    region=None,
+    aggregation=None,
+    layout="scores",
+):
+    """Compile the figure specifications of all requested plot types.
+
+    Args:
+        plot_setup (dict): parsed user input (see parse_inputs)
+        plot_types (list): plot types to plan (see parse_plot_types)
+        lt_ranges (str): lead time ranges of interest (i.e. 07-12,19-24)
+        input_dir (str): directory to seasons (i.e. /scratch/osm/movero/wd)
+        topography (str): topography file to add relief to the station maps
+        domain (str): map domain of the station maps (see domains)
+        region (dict): region of the stations of the station maps (see regions)
+        aggregation (dict): cells of the station maps (see cell_aggregation)
+        layout (str): figures of the station maps, per lead time range
+            (scores) or with all lead time ranges (lead_times)
+
+    Returns:
+        list: figure specifications, in rendering order
+
+    """
+    plan = []
+    for plot_type in plot_types:
+        module, _, _ = PLOT_TYPES[plot_type]
+        print(f"--- planning {plot_type} score figures")
+        if plot_type == "station":
+            plan.extend(
+                module._plan_figures(
+                    plot_setup,
+                    lt_ranges,
+                    input_dir,
+                    topography=topography,
+                    domain=domain,
+                    region=region,
+                    aggregation=aggregation,
+                    layout=layout,
+                )
+            )
+        else:
+            plan.extend(module._plan_figures(plot_setup, lt_ranges, input_dir))
+    return plan
+
+
+def parse_shard(shard: str) -> tuple:
+    """Parse the --shard input ``i/N`` into (i, N), with 1 <= i <= N."""
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError as error:
+        raise ValueError(f"Invalid shard {shard!r}, expected i/N.") from error
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {shard!r}, expected 1 <= i <= N.")
+    return index, count
+
+
+def shard_plan(plan, shard) -> list:
+    """Select the figures of one shard (i, N) of the plan.
+
+    The figures are dealt round-robin in plan order. As the plan is ordered
+    by plot type, every shard gets the same number of figures of each plot
+    type (+-1), and the N shards are disjoint and cover the whole plan.
+    """
+    index, count = shard
+    return plan[index - 1 :: count]
+
+
+def select_figures(plan, patterns) -> list:
+    """Select the figures whose output name matches any of the glob patterns.
+
+    Like a shard (see shard_plan), the selection is rendered with all input
+    files of the data keys of its figures, not only the files it draws (see
+    execute_plan).
+    """
+    return [
+        spec
+        for spec in plan
+        if any(fnmatch.fnmatchcase(spec["output"], pattern) for pattern in patterns)
+    ]
+
+
+def plan_counts(plan) -> dict:
+    """Count the figures per plot type."""
+    counts = Counter(spec["plot_type"] for spec in plan)
+    return {
+        plot_type: counts[plot_type] for plot_type in PLOT_TYPES if counts[plot_type]
+    }
+
+
+def plan_to_json(plan) -> str:
+    return json.dumps(
+        {"counts": plan_counts(plan), "total": len(plan), "figures": plan},
+        indent=2,
+    )
+
+
+def load_plan_data(plan, input_dir, workers=1) -> dict:
+    """Read the input files of the plan, once per data key.
+
+    Returns:
+        dict: data key -> nested dict of headers and data frames, as returned
+        by ``load_files.load_input_files``
+
+    """
+    inputs = {}
+    for spec in plan:
+        files = inputs.setdefault(spec["data_key"], {})
+        files.update(dict.fromkeys(spec["inputs"]))
+
+    plan_data = {}
+
+    def _load(data_key, files):
+        plot_type = data_key.split(":", maxsplit=1)[0]
+        _, transform_func, ltr_first = PLOT_TYPES[plot_type]
+        plan_data[data_key] = load_input_files(
+            input_dir,
+            list(files),
+            ltr_first=ltr_first,
+            transform_func=transform_func,
+        )
+
+    run_jobs(_load, list(inputs.items()), workers)
+    return plan_data
+
+
+def render_spec(spec, plan_data, output_dir):
+    module, _, _ = PLOT_TYPES[spec["plot_type"]]
+    module._render_figure(spec, plan_data[spec["data_key"]], output_dir)
+
+
+def _timed(render, runtimes):
+    """Wrap render(spec, ...) to store the runtime of each figure."""
+
+    def _render(spec, *args):
+        start = time.perf_counter()
+        render(spec, *args)
+        runtimes[spec["output"]] = time.perf_counter() - start
+
+    return _render
+
+
+def _modified_ns(path):
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _journaled(render, record, fingerprints, output_dir):
+    """Wrap render(spec, ...) to journal each figure saved by the render.
+
+    A figure without valid data is not saved, i.e. a file left by a previous
+    run (or another process) is not journaled.
+    """
+
+    def _render(spec, *args):
+        figure_path = Path(output_dir) / spec["output"]
+        modified = _modified_ns(figure_path)
+        render(spec, *args)
+        if _modified_ns(figure_path) not in (None, modified):
+            record(spec["output"], fingerprints[spec["output"]])
+
+    return _render
+
+
+def _record(figures, runtimes, input_dir, cost_file):
+    record_runtimes(
+        cost_file,
+        [
+            {
+                "kind": figure_kind(spec),
+                "seconds": runtimes[spec["output"]],
+                **figure_features(spec, input_dir),
+            }
+            for spec in figures
+            if spec["output"] in runtimes
+        ],
+    )
+
+
+def _memory_limiter(workers, memory_budget):
+    if workers <= 1:
+        return None
+    return MemoryLimiter(workers, budget_mb=memory_budget)
+
+
+def execute_plan(
+    plan,
+    input_dir,
+    output_dir,
+    workers=1,
+    figures=None,
+    cost_file=None,
+    memory_budget=None,
+    resume=False,
+):
+    """Load the inputs of the plan and render all its figures.
+
+    If figures (i.e. a shard, see shard_plan, or the figures selected with
+    --only, see select_figures) of the plan are given, only
+    these are rendered. Their input files are loaded together with all files
+    sharing the same data key, such that the figures are identical to those
+    of a run of the whole plan.
+
+    The figures predicted to take longest are rendered first (see
+    cost_model); their runtimes are recorded in the cost file. Up to
+    ``workers`` figures are rendered concurrently, as long as the memory
+    allows for it (see autoscale).
+
+    Saved figures are journaled in the output directory with the fingerprint
+    of their inputs and settings (see journal). When resuming, figures with
+    a complete output file and an unchanged fingerprint are skipped.
+    """
+    cost_file = cost_file or default_cost_file()
+    figures = plan if figures is None else figures
+    fingerprints = figure_fingerprints(plan, input_dir)
+    if resume:
+        completed = completed_figures(figures, output_dir, fingerprints)
+        print(f"--- {len(completed)} figures are up to date")
+        figures = [spec for spec in figures if spec["output"] not in completed]
+    data_keys = {spec["data_key"] for spec in figures}
+    plan_data = load_plan_data(
+        [spec for spec in plan if spec["data_key"] in data_keys],
+        input_dir,
+        workers,
+    )
+    costs = predict_costs(figures, input_dir, cost_file)
+    figures = longest_first(figures, costs)
+    print(f"--- rendering {len(figures)} figures")
+    runtimes: dict = {}
+    limiter = _memory_limiter(workers, memory_budget)
+    start = time.perf_counter()
+    record = journal_writer(output_dir)
+    run_jobs(
+        _timed(_journaled(render_spec, record, fingerprints, output_dir), runtimes),
+        [(spec, plan_data, output_dir) for spec in figures],
+        workers,
+        limiter=limiter,
+    )
+    actual_makespan = time.perf_counter() - start
+    _record(figures, runtimes, input_dir, cost_file)
+    print(run_report(figures, costs, runtimes, workers, actual_makespan))
+    if limiter is not None:
+        print(f"--- at most {limiter.peak_running} figures rendered concurrently")
+
+
+def execute_queue(
+    plan,
+    input_dir,
+    output_dir,
+    queue_dir,
+    workers=1,
+    figures=None,
+    lease_seconds=LEASE_SECONDS,
+    cost_file=None,
+    memory_budget=None,
+):
+    """Render the figures of the plan as one worker of a shared work queue.
+
+    The inputs of a data key are loaded when the first of its figures is
+    claimed (see work_queue). Figures are claimed longest first, as long as
+    the memory allows for it (see autoscale).
+    """
+    cost_file = cost_file or default_cost_file()
+    figures = plan if figures is None else figures
+    figures = longest_first(figures, predict_costs(figures, input_dir, cost_file))
+    runtimes: dict = {}
+    plan_data: dict = {}
+    load_lock = threading.Lock()
+
+    def _render(spec, render_dir):
+        with load_lock:
+            if spec["data_key"] not in plan_data:
+                plan_data.update(
+                    load_plan_data(
+                        [s for s in plan if s["data_key"] == spec["data_key"]],
+                        input_dir,
+                    )
+                )
+        render_spec(spec, plan_data, render_dir)
+
+    print(f"--- rendering figures of the queue {queue_dir}")
+    published = run_worker(
+        figures,
+        queue_dir,
+        output_dir,
+        _timed(_render, runtimes),
+        workers=workers,
+        lease_seconds=lease_seconds,
+        limiter=_memory_limiter(workers, memory_budget),
+    )
+    _record(figures, runtimes, input_dir, cost_file)
+    print(f"--- rendered {published} figures")
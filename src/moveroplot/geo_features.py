@@ -0,0 +1,139 @@
+"""Geographic features clipped and simplified per map domain, for offline use.
+
+Cartopy draws a map feature (i.e. the Natural Earth coastlines) by reading
+its global geometries and projecting all of them which intersect the view.
+For a fixed domain, this is done once here: the geometries are clipped to
+the domain, projected into the map projection, simplified to the pixel size
+of the map and stored in a local directory. Plotting loads them from there,
+such that neither the projection of the global geometries nor the Natural
+Earth download cache are needed on the compute nodes.
+"""
+# Standard library
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# Third-party
+import cartopy.crs as ccrs
+import shapely.wkb
+from shapely.geometry import box
+
+# First-party
+from moveroplot.plotting import new_figure
+
+# margin around the domain (fraction of its size) kept when clipping
+CLIP_MARGIN = 0.1
+
+
+def default_feature_dir() -> Path:
+    cache_dir = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_dir) / "moveroplot" / "features"
+
+
+def features_key(extent, projection, size_px, names) -> str:
+    """Digest of the domain and the features prepared for it."""
+    dependencies = {
+        "extent": [float(value) for value in extent],
+        "projection": projection.proj4_init,
+        "size_px": [round(value) for value in size_px],
+        "features": list(names),
+    }
+    return hashlib.sha1(json.dumps(dependencies, sort_keys=True).encode()).hexdigest()
+
+
+def prepare_features(features, extent, projection, size_px) -> dict:
+    """Clip, project and simplify the geometries of features for a domain.
+
+    Args:
+        features (dict): name -> cartopy feature
+        extent (list): lon/lat extent of the map
+        projection (cartopy.crs.Projection): projection of the map
+        size_px (tuple): width and height of the map in pixels
+
+    Returns:
+        dict: name -> list of geometries in the map projection
+
+    """
+    # the geometries are selected like cartopy does when drawing the map
+    fig = new_figure(figsize=(size_px[0] / 100, size_px[1] / 100), dpi=100)
+    ax = fig.add_axes((0, 0, 1, 1), projection=projection)
+    ax.set_extent(extent, crs=ccrs.PlateCarree())
+    x0, x1, y0, y1 = ax.get_extent()
+    # simplify to half a pixel of the map
+    tolerance = 0.5 * min((x1 - x0) / size_px[0], (y1 - y0) / size_px[1])
+    prepared = {}
+    for name, feature in features.items():
+        lon0, lon1, lat0, lat1 = ax.get_extent(feature.crs)
+        margin_x = CLIP_MARGIN * (lon1 - lon0)
+        margin_y = CLIP_MARGIN * (lat1 - lat0)
+        clip = box(lon0 - margin_x, lat0 - margin_y, lon1 + margin_x, lat1 + margin_y)
+        geometries = []
+        for geometry in feature.intersecting_geometries((lon0, lon1, lat0, lat1)):
+            clipped = geometry.intersection(clip)
+            if clipped.is_empty:
+                continue
+            projected = projection.project_geometry(clipped, feature.crs)
+            simplified = projected.simplify(tolerance, preserve_topology=True)
+            if not simplified.is_empty:
+                geometries.append(simplified)
+        prepared[name] = geometries
+    return prepared
+
+
+def clip_features(prepared, bounds) -> dict:
+    """Clip prepared features to a part of their domain (e.g. a region).
+
+    Args:
+        prepared (dict): name -> geometries in the map projection
+        bounds (tuple): x0, x1, y0, y1 of the part in the map projection
+
+    Returns:
+        dict: name -> geometries which intersect the part (w/ margin)
+
+    """
+    x0, x1, y0, y1 = bounds
+    margin_x, margin_y = CLIP_MARGIN * (x1 - x0), CLIP_MARGIN * (y1 - y0)
+    clip = box(x0 - margin_x, y0 - margin_y, x1 + margin_x, y1 + margin_y)
+    clipped = {}
+    for name, geometries in prepared.items():
+        clipped[name] = [
+            geometry.intersection(clip)
+            for geometry in geometries
+            if geometry.intersects(clip)
+        ]
+    return clipped
+
+
+def store_features(feature_dir, key, prepared):
+    """Store prepared features (name -> geometries) in the feature directory."""
+    feature_dir = Path(feature_dir)
+    feature_dir.mkdir(parents=True, exist_ok=True)
+    temp_path = feature_dir / f".{key}.{os.getpid()}.{threading.get_ident()}.json"
+    content = {
+        name: [shapely.wkb.dumps(geometry, hex=True) for geometry in geometries]
+        for name, geometries in prepared.items()
+    }
+    temp_path.write_text(json.dumps(content), encoding="utf-8")
+    os.replace(temp_path, feature_dir / f"{key}.json")
+
+
+def load_features(feature_dir, key):
+    """Load prepared features of the feature directory.
+
+    Returns:
+        dict: name -> geometries in the map projection, or None if the
+        features of the domain were not prepared
+
+    """
+    try:
+        content = json.loads(
+            (Path(feature_dir) / f"{key}.json").read_text(encoding="utf-8")
+        )
+    except (OSError, ValueError):
+        return None
+    return {
+        name: [shapely.wkb.loads(geometry, hex=True) for geometry in geometries]
+        for name, geometries in content.items()
+    }
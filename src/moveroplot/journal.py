@@ -0,0 +1,177 @@
+"""Journal of the completed figures, to resume runs and to rebuild incrementally.
+
+Each line of the journal in the output directory records a figure which was
+saved completely, with the size of its file and the fingerprint of what it
+was rendered from: its specification, the model colors, the moveroplot
+version and the path, size and modification time of its input files.
+A figure whose entry matches its complete file and current fingerprint does
+not need to be rendered again.
+
+Several runs may share an output directory: they append to the journal under
+a shared lock, while compacting it takes an exclusive one.
+"""
+# Standard library
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+# First-party
+from moveroplot import __version__
+from moveroplot.config import plot_settings
+
+JOURNAL_NAME = ".moveroplot_journal.jsonl"
+_LOCK_NAME = ".moveroplot_journal.lock"
+# last chunk of every PNG file
+_PNG_END = b"IEND\xaeB`\x82"
+
+
+def _file_fingerprint(input_dir, file):
+    try:
+        stat = (Path(input_dir) / file).stat()
+    except OSError:
+        return [file, None, None]
+    return [file, stat.st_size, stat.st_mtime_ns]
+
+
+def figure_fingerprints(plan, input_dir) -> dict:
+    """Fingerprint the figures of the plan.
+
+    A figure depends on all input files of its data key (i.e. the period in
+    its title), not only on the files it draws.
+
+    Returns:
+        dict: output name -> fingerprint
+
+    """
+    data_key_inputs: dict = {}
+    for spec in plan:
+        data_key_inputs.setdefault(spec["data_key"], {}).update(
+            dict.fromkeys(spec["inputs"])
+        )
+    files = {
+        data_key: [_file_fingerprint(input_dir, file) for file in sorted(inputs)]
+        for data_key, inputs in data_key_inputs.items()
+    }
+    fingerprints = {}
+    for spec in plan:
+        dependencies = {
+            "version": __version__,
+            "spec": spec,
+            "colors": [plot_settings.modelcolors.get(m) for m in spec["models"]],
+            "inputs": files[spec["data_key"]],
+        }
+        fingerprints[spec["output"]] = hashlib.sha1(
+            json.dumps(dependencies, sort_keys=True).encode()
+        ).hexdigest()
+    return fingerprints
+
+
+def read_journal(output_dir) -> dict:
+    """Read the journal (output name -> last entry), ignoring torn lines."""
+    completed = {}
+    try:
+        with open(Path(output_dir) / JOURNAL_NAME, encoding="utf-8") as lines:
+            for line in lines:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                completed[entry["output"]] = entry
+    except FileNotFoundError:
+        pass
+    return completed
+
+
+def is_complete(path, size) -> bool:
+    """Check that a figure file has the recorded size and is not truncated."""
+    path = Path(path)
+    try:
+        if path.stat().st_size != size:
+            return False
+        if path.suffix != ".png":
+            return True
+        with open(path, "rb") as figure:
+            figure.seek(-len(_PNG_END), os.SEEK_END)
+            return figure.read() == _PNG_END
+    except OSError:
+        return False
+
+
+def completed_figures(figures, output_dir, fingerprints) -> set:
+    """Outputs of the figures which are up to date and complete on disk."""
+    journal = read_journal(output_dir)
+    return {
+        spec["output"]
+        for spec in figures
+        if spec["output"] in journal
+        and journal[spec["output"]].get("fingerprint") == fingerprints[spec["output"]]
+        and is_complete(
+            Path(output_dir) / spec["output"], journal[spec["output"]]["size"]
+        )
+    }
+
+
+@contextmanager
+def _journal_lock(output_dir, operation):
+    """Lock the journal of the output directory (fcntl.LOCK_SH or LOCK_EX)."""
+    with open(Path(output_dir) / _LOCK_NAME, "ab") as lock_file:
+        fcntl.flock(lock_file, operation)
+        yield
+
+
+def _compact_journal(output_dir):
+    """Rewrite the journal with the last entry of each figure only."""
+    journal_path = Path(output_dir) / JOURNAL_NAME
+    with _journal_lock(output_dir, fcntl.LOCK_EX):
+        if not journal_path.exists():
+            return
+        # a file per run, the entries of concurrent runs are never lost
+        fd, temp_name = tempfile.mkstemp(
+            prefix=f"{JOURNAL_NAME}.", suffix=".tmp", dir=output_dir
+        )
+        try:
+            with open(fd, "w", encoding="utf-8") as journal:
+                for entry in read_journal(output_dir).values():
+                    journal.write(json.dumps(entry) + "\n")
+            os.chmod(temp_name, journal_path.stat().st_mode)
+            os.replace(temp_name, journal_path)
+        except BaseException:
+            os.unlink(temp_name)
+            raise
+
+
+def journal_writer(output_dir):
+    """Open the journal of the output directory.
+
+    The journal is compacted to the last entry of each figure first.
+
+    Returns:
+        callable: record(output, fingerprint) adds a saved figure
+
+    """
+    journal_path = Path(output_dir) / JOURNAL_NAME
+    _compact_journal(output_dir)
+    lock = threading.Lock()
+
+    def record(output, fingerprint):
+        figure_path = Path(output_dir) / output
+        if not figure_path.exists():
+            # nothing rendered, i.e. no valid data
+            return
+        entry = {
+            "output": output,
+            "size": figure_path.stat().st_size,
+            "fingerprint": fingerprint,
+        }
+        with lock, _journal_lock(output_dir, fcntl.LOCK_SH):
+            with open(journal_path, "a", encoding="utf-8") as journal:
+                journal.write(json.dumps(entry) + "\n")
+                journal.flush()
+                os.fsync(journal.fileno())
+
+    return record
@@ -1,7 +1,10 @@
 """General function to load and collect atab files."""
 
 # Standard library
+import copy
 import re
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
@@ -10,6 +13,12 @@ from pathlib import Path
 from .utils.atab import Atab
 
 
+# files kept in memory, i.e. for the next runs of a batch
+ATAB_CACHE_SIZE = 256
+_atab_cache: OrderedDict = OrderedDict()
+_atab_cache_lock = threading.Lock()
+
+
 # pylint: disable=too-many-arguments,too-many-locals
 def is_valid_data(header):
     try:
@@ -21,59 +30,124 @@ def is_valid_data(header):
         return False
 
 
-def load_relevant_files(
+def get_lt_range(file_name):
+    ltr_match = re.search(r"(\d{2,3})(-\d{2,3})*", file_name)
+    if not ltr_match:
+        raise IOError(f"The filename {file_name} does not contain a LT range.")
+    return ltr_match.group()
+
+
+def find_relevant_files(
     input_dir,
     file_prefix,
     file_postfix,
-    debug,
     model_plots,
     parameter,
     lt_ranges,
-    ltr_first=True,
-    transform_func=None,
 ):
-    corresponding_files_dict = {}
-    files_list = []
+    """Find the files of the given models and parameter, without reading them.
+
+    Returns:
+        list: (model, lt_range, file_path) tuples, ordered by model and file name.
+
+    """
+    relevant_files = []
     for model in model_plots:
         source_path = Path(f"{input_dir}/{model}")
-        for file_path in source_path.glob(f"{file_prefix}*{parameter}{file_postfix}"):
+        for file_path in sorted(
+            source_path.glob(f"{file_prefix}*{parameter}{file_postfix}")
+        ):
             if file_path.is_file():
-                ltr_match = re.search(r"(\d{2,3})(-\d{2,3})*", file_path.name)
-                if ltr_match:
-                    lt_range = ltr_match.group()
-                else:
-                    raise IOError(
-                        f"The filename {file_path.name} does not contain a LT range."
-                    )
-
+                lt_range = get_lt_range(file_path.name)
                 in_lt_ranges = True
                 if lt_ranges:
                     in_lt_ranges = lt_range in lt_ranges
 
                 if in_lt_ranges:
-                    # extract header & dataframe
-                    loaded_atab = Atab(file=file_path, sep=" ")
-                    header = loaded_atab.header
-                    df = loaded_atab.data
-                    if transform_func:
-                        df = transform_func(df, header)
-                    if is_valid_data(header):
-                        # add information to dict
-                        first_key, second_key = (
-                            (lt_range, model) if ltr_first else (model, lt_range)
-                        )
-                        corresponding_files_dict.setdefault(first_key, {})[
-                            second_key
-                        ] = {
-                            "header": header,
-                            "df": df,
-                        }
-
-                        # add path of file to list of relevant files
-                        files_list.append(file_path)
-
-    if debug:
-        print(f"\nFor parameter: {parameter} these files are relevant:\n")
-        print("Found files: ", files_list)
+                    relevant_files.append((model, lt_range, file_path))
+    return relevant_files
+
+
+def index_relevant_files(
+    input_dir,
+    file_prefix,
+    file_postfix,
+    model_plots,
+    parameter,
+    lt_ranges,
+    ltr_first=True,
+):
+    """Collect the relevant files, without reading them (see ``load_input_files``).
+
+    Returns:
+        dict: nested dict (lt_range -> model or model -> lt_range) of the
+        file paths relative to the input directory.
+
+    """
+    files_index = {}
+    for model, lt_range, file_path in find_relevant_files(
+        input_dir, file_prefix, file_postfix, model_plots, parameter, lt_ranges
+    ):
+        first_key, second_key = (lt_range, model) if ltr_first else (model, lt_range)
+        files_index.setdefault(first_key, {})[second_key] = str(
+            file_path.relative_to(Path(input_dir))
+        )
+    return files_index
+
+
+def load_input_files(input_dir, inputs, ltr_first=True, transform_func=None):
+    """Load files given relative to the input directory (<model>/<file name>)."""
+    relevant_files = [
+        (Path(file).parts[0], get_lt_range(Path(file).name), Path(input_dir) / file)
+        for file in inputs
+    ]
+    return load_files(relevant_files, ltr_first, transform_func)
 
+
+def load_files(relevant_files, ltr_first=True, transform_func=None):
+    """Load (model, lt_range, file_path) tuples into a nested dictionary.
+
+    Files with an invalid header are skipped.
+    """
+    corresponding_files_dict = {}
+    for model, lt_range, file_path in relevant_files:
+        header, df = _load_atab(file_path, transform_func)
+        if is_valid_data(header):
+            # add information to dict
+            first_key, second_key = (
+                (lt_range, model) if ltr_first else (model, lt_range)
+            )
+            corresponding_files_dict.setdefault(first_key, {})[second_key] = {
+                "header": header,
+                "df": df,
+            }
     return corresponding_files_dict
+
+
+def _load_atab(file_path, transform_func=None):
+    """Read the header & (transformed) dataframe of a file, w/ a LRU cache.
+
+    The cache is keyed by the size and modification time of the file, copies
+    are returned such that the cached data cannot be modified.
+    """
+    stat = Path(file_path).stat()
+    key = (str(file_path), stat.st_size, stat.st_mtime_ns, transform_func)
+    with _atab_cache_lock:
+        cached = _atab_cache.get(key)
+        if cached is not None:
+            _atab_cache.move_to_end(key)
+    if cached is None:
+        # extract header & dataframe
+        loaded_atab = Atab(file=file_path, sep=" ")
+        header = loaded_atab.header
+        df = loaded_atab.data
+        if transform_func:
+            df = transform_func(df, header)
+        cached = (header, df)
+        with _atab_cache_lock:
+            _atab_cache[key] = cached
+            while len(_atab_cache) > ATAB_CACHE_SIZE:
+                _atab_cache.popitem(last=False)
+    header, df = cached
+    return copy.deepcopy(header), df.copy()
+
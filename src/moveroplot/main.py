@@ -52,14 +52,22 @@ from typing import Optional
 from click import Context
 
 # Local
-from .daytime_scores import _daytime_scores_pipeline
-from .ensemble_scores import _ensemble_scores_pipeline
+from .figure_plan import compile_plan
+from .figure_plan import execute_plan
+from .figure_plan import execute_queue
+from .figure_plan import parse_plot_types
+from .figure_plan import parse_shard
+from .figure_plan import plan_counts
+from .figure_plan import plan_to_json
+from .figure_plan import select_figures
+from .figure_plan import shard_plan
+from .regions import select_region
+from .render_server import serve_figures
+from .watch import affected_figures
+from .watch import watch_inputs
 
 # local
 from .parse_inputs import _parse_inputs
-from .station_scores import _station_scores_pipeline
-from .time_scores import _time_scores_pipeline
-from .total_scores import _total_scores_pipeline
 
 
 # pylint: enable=line-too-long
@@ -90,6 +98,28 @@ def main(
     colors: Optional[str],
     plot_type: str,
     topography: Optional[str],
+    domain: Optional[str] = None,
+    bbox: Optional[str] = None,
+    region: Optional[str] = None,
+    station_map: str = "stations",
+    station_cells: int = 40,
+    station_layout: str = "scores",
+    workers: int = 1,
+    dry_run: bool = False,
+    plan_file: Optional[str] = None,
+    shard: Optional[str] = None,
+    queue_dir: Optional[str] = None,
+    lease_seconds: float = 300,
+    cost_file: Optional[str] = None,
+    memory_budget: Optional[float] = None,
+    resume: bool = False,
+    only: tuple = (),
+    serve_http: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    cache_mb: float = 256,
+    disk_cache_mb: float = 2048,
+    watch: bool = False,
+    poll_seconds: float = 30,
 ):
     """Entry Point for the MOVERO Plotting Pipeline.
 
@@ -123,8 +153,15 @@ def main(
     # -1. Check plot type input
     if plot_type is None:
         raise ValueError("ERROR: No plot type argument --plot_type.")
+    plot_types = parse_plot_types(plot_type)
+    if shard is not None:
+        shard = parse_shard(shard)
+    map_region = select_region(bbox, region)
+    aggregation = None
+    if station_map != "stations":
+        aggregation = {"shape": station_map, "cells": station_cells}
 
-    if not Path(output_dir).exists():
+    if not dry_run and not Path(output_dir).exists():
         Path(output_dir).mkdir(parents=True, exist_ok=True)
 
     # 0. PARSE USER INPUT
@@ -146,60 +183,108 @@ def main(
         plot_type,
     )
     print("PLOT SETUP ", plot_setup)
-    # 1. INITIALISE STATION SCORES PLOTTING PIPELINE
-    if "station" in plot_type:
-        _station_scores_pipeline(
-            plot_setup=plot_setup,
-            lt_ranges=lt_ranges,
-            file_prefix="station_scores",
-            file_postfix=".dat",
-            input_dir=input_dir,
-            output_dir=output_dir,
-            debug=debug,
-            topography=topography,
+    if serve_http is not None:
+        serve_figures(
+            lambda: compile_plan(
+                plot_setup,
+                plot_types,
+                lt_ranges,
+                input_dir,
+                topography=topography,
+                domain=domain,
+                region=map_region,
+                aggregation=aggregation,
+                layout=station_layout,
+            ),
+            input_dir,
+            serve_http,
+            cache_dir=cache_dir,
+            memory_mb=cache_mb,
+            disk_mb=disk_cache_mb,
         )
-    # 2. INITIALISE TIME SERIES PLOTTING PIPELINE
-    if "time" in plot_type:
-        _time_scores_pipeline(
-            plot_setup=plot_setup,
-            lt_ranges=lt_ranges,
-            file_prefix="time_scores",
-            file_postfix=".dat",
-            input_dir=input_dir,
-            output_dir=output_dir,
-            debug=debug,
+        return
+
+    # 1. COMPILE THE FIGURE PLAN (station, time, daytime, total, ensemble)
+    def _compile():
+        plan = compile_plan(
+            plot_setup,
+            plot_types,
+            lt_ranges,
+            input_dir,
+            topography=topography,
+            domain=domain,
+            region=map_region,
+            aggregation=aggregation,
+            layout=station_layout,
         )
-    # 3. INITIALISE DYURNAL CYCLE PLOTTING PIPELINE
-    if "daytime" in plot_type:
-        _daytime_scores_pipeline(
-            plot_setup=plot_setup,
-            lt_ranges=lt_ranges,
-            file_prefix="daytime_scores",
-            file_postfix=".dat",
-            input_dir=input_dir,
-            output_dir=output_dir,
-            debug=debug,
+        figures = plan
+        if only:
+            patterns = [pattern for value in only for pattern in value.split(",")]
+            figures = select_figures(figures, patterns)
+            if not figures:
+                print(f"No figure matches {patterns}.")
+        if shard is not None:
+            figures = shard_plan(figures, shard)
+        return plan, figures
+
+    plan, figures = _compile()
+    if plan_file:
+        Path(plan_file).write_text(plan_to_json(figures), encoding="utf-8")
+    if dry_run:
+        if not plan_file:
+            print(plan_to_json(figures))
+        for p_type, count in plan_counts(figures).items():
+            print(f"{p_type}: {count} figures")
+        print(f"all plot types: {len(figures)} figures")
+        return
+
+    # 2. RENDER ALL FIGURES OF THE PLAN (OR OF ITS SHARD)
+    if queue_dir:
+        execute_queue(
+            plan,
+            input_dir,
+            output_dir,
+            queue_dir,
+            workers=workers,
+            figures=figures,
+            lease_seconds=lease_seconds,
+            cost_file=cost_file,
+            memory_budget=memory_budget,
         )
-    # 4. INITIALIS TOTAL SCORES PLOTTING PIPELINE
-    if "total" in plot_type:
-        _total_scores_pipeline(
-            plot_setup=plot_setup,
-            lt_ranges=lt_ranges,
-            file_prefix="total_scores",
-            file_postfix=".dat",
-            input_dir=input_dir,
-            output_dir=output_dir,
-            debug=debug,
+    else:
+        execute_plan(
+            plan,
+            input_dir,
+            output_dir,
+            workers=workers,
+            figures=figures,
+            cost_file=cost_file,
+            memory_budget=memory_budget,
+            resume=resume,
         )
 
-    if "ensemble" in plot_type:
-        _ensemble_scores_pipeline(
-            plot_setup=plot_setup,
-            lt_ranges=lt_ranges,
-            file_prefix="total_scores",
-            file_postfix=".dat",
-            input_dir=input_dir,
-            output_dir=output_dir,
-            debug=debug,
+    # 3. RE-RENDER THE FIGURES DEPENDING ON CHANGED INPUT FILES
+    if watch:
+
+        def _render_changed(changed):
+            plan, figures = _compile()
+            figures = affected_figures(figures, changed)
+            print(f"--- {len(figures)} figures depend on the changed files")
+            execute_plan(
+                plan,
+                input_dir,
+                output_dir,
+                workers=workers,
+                figures=figures,
+                cost_file=cost_file,
+                memory_budget=memory_budget,
+                resume=True,
+            )
+
+        watch_inputs(
+            _render_changed,
+            input_dir,
+            dict.fromkeys(m for group in plot_setup["model_versions"] for m in group),
+            poll_seconds=poll_seconds,
         )
     print("\n--- Done.")
@@ -0,0 +1,142 @@
+"""Persistent cache of the pre-rendered map backgrounds of station score maps.
+
+Rendering the geographic features (and the topography) of a map with cartopy
+takes seconds, while the result only depends on the map: its extent and
+projection, the topography file, the size of the image in pixels and the
+drawn features. Backgrounds are stored as RGBA arrays in a cache directory,
+keyed by a digest of these, such that later runs and other processes load
+the image instead of rendering it. Loaded images are memory mapped, i.e.
+the processes rendering maps on a node share one copy of each background.
+"""
+# Standard library
+import fcntl
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# Third-party
+import cartopy
+import matplotlib
+import numpy as np
+
+# First-party
+from moveroplot import __version__
+
+
+def default_background_dir() -> Path:
+    cache_dir = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_dir) / "moveroplot" / "backgrounds"
+
+
+def _file_identity(path):
+    if path is None:
+        return None
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return [str(Path(path).absolute()), None, None]
+    return [str(Path(path).resolve()), stat.st_size, stat.st_mtime_ns]
+
+
+def background_key(extent, projection, topography, size_px, features) -> str:
+    """Digest of everything a map background is rendered from.
+
+    Args:
+        extent (list): lon/lat extent of the map
+        projection (cartopy.crs.CRS): projection of the map
+        topography (str): topography file, or None
+        size_px (tuple): width and height of the rendered image in pixels
+        features (tuple): names of the drawn geographic features
+
+    Returns:
+        str: key of the background in the cache
+
+    """
+    dependencies = {
+        "extent": [float(value) for value in extent],
+        "projection": projection.proj4_init,
+        "topography": _file_identity(topography),
+        "size_px": [round(value) for value in size_px],
+        "features": list(features),
+        # the rendering of the features may change with the libraries
+        "versions": [__version__, cartopy.__version__, matplotlib.__version__],
+    }
+    return hashlib.sha1(json.dumps(dependencies, sort_keys=True).encode()).hexdigest()
+
+
+def load_background(cache_dir, key):
+    """Map a background of the cache directory into memory, read-only.
+
+    The image is not copied: all processes of the node which load it share
+    the pages of the file.
+
+    Returns:
+        tuple: (rgba_array, xlim, ylim), or None if it is not cached
+
+    """
+    cache_dir = Path(cache_dir)
+    try:
+        limits = json.loads((cache_dir / f"{key}.json").read_text())
+        rgba = np.load(cache_dir / f"{key}.npy", mmap_mode="r")
+    except (OSError, ValueError, KeyError):
+        return None
+    return rgba, tuple(limits["xlim"]), tuple(limits["ylim"])
+
+
+def store_background(cache_dir, key, background):
+    """Store a background (rgba_array, xlim, ylim) in the cache directory."""
+    rgba, xlim, ylim = background
+    cache_dir = Path(cache_dir)
+    temp_prefix = f".{key}.{os.getpid()}.{threading.get_ident()}"
+    limits = {"xlim": [float(x) for x in xlim], "ylim": [float(y) for y in ylim]}
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # the image is published last, such that its limits exist when it does
+        for suffix, write in (
+            (".json", lambda file: file.write(json.dumps(limits).encode())),
+            (".npy", lambda file: np.save(file, np.ascontiguousarray(rgba))),
+        ):
+            temp_path = cache_dir / f"{temp_prefix}{suffix}"
+            with open(temp_path, "wb") as file:
+                write(file)
+            os.replace(temp_path, cache_dir / f"{key}{suffix}")
+    except OSError as error:
+        for temp_path in cache_dir.glob(f"{temp_prefix}.*"):
+            temp_path.unlink(missing_ok=True)
+        print(f"Could not store the map background: {error}")
+
+
+def cached_background(cache_dir, key, render):
+    """Load a background from the cache, or render and store it.
+
+    Processes sharing the cache directory render each background once: while
+    one of them renders, the others wait for it and load its image.
+
+    Args:
+        cache_dir (str): cache directory of the backgrounds
+        key (str): key of the background, see background_key
+        render (callable): returns the background (rgba_array, xlim, ylim)
+
+    Returns:
+        tuple: (rgba_array, xlim, ylim), mapped read-only from the cache
+        directory if it could be stored
+
+    """
+    background = load_background(cache_dir, key)
+    if background is not None:
+        return background
+    try:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        lock_file = open(Path(cache_dir) / f".{key}.lock", "wb")
+    except OSError:
+        # not writable, render for this process only
+        return render()
+    with lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        background = load_background(cache_dir, key)
+        if background is None:
+            store_background(cache_dir, key, render())
+            background = load_background(cache_dir, key) or render()
+    return background
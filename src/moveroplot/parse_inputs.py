@@ -237,11 +237,14 @@ def _parse_inputs(
                             ]
                         )
 
-    all_keys = (
-        set(regular_params_dict)
-        | set(cat_params_dict)
-        | set(regular_ens_params_dict)
-        | set(ens_cat_params_dict)
+    # ordered (not a set), such that the figure plan does not depend on hashing
+    all_keys = dict.fromkeys(
+        [
+            *regular_params_dict,
+            *cat_params_dict,
+            *regular_ens_params_dict,
+            *ens_cat_params_dict,
+        ]
     )
     plot_setup["parameter"] = {
         key: {
@@ -1,8 +1,15 @@
 """General functions to create plots."""
 
 # Standard library
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Third-party
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
 
 def get_total_dates_from_headers(headers: list):
     total_start_date = min(
@@ -13,3 +20,139 @@ def get_total_dates_from_headers(headers: list):
         datetime.strptime(header["End time"][0], "%Y-%m-%d") for header in headers
     )
     return total_start_date, total_end_date
+
+
+def new_figure(**fig_kw) -> Figure:
+    """Create a figure with its own Agg canvas.
+
+    The figure is not registered with ``pyplot``, hence it does not touch any
+    global state and does not need to be closed explicitly. This allows several
+    figures to be rendered concurrently on different threads.
+    """
+    fig = Figure(**fig_kw)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+def new_subplots(nrows=1, ncols=1, *, squeeze=True, subplot_kw=None, **fig_kw):
+    """Equivalent of ``pyplot.subplots`` based on :func:`new_figure`."""
+    fig = new_figure(**fig_kw)
+    axes = fig.subplots(
+        nrows=nrows, ncols=ncols, squeeze=squeeze, subplot_kw=subplot_kw
+    )
+    return fig, axes
+
+
+# thread pools shared by all runs of the process, by number of workers
+_pools: dict = {}
+_pools_lock = threading.Lock()
+_pool_thread = threading.local()
+
+
+def _shared_pool(workers):
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="moveroplot",
+                initializer=setattr,
+                initargs=(_pool_thread, "in_pool", True),
+            )
+        return _pools[workers]
+
+
+def run_jobs(func, jobs, workers=1, limiter=None):
+    """Call ``func(*job)`` for each job, on a thread pool if workers > 1.
+
+    The thread pool is kept for later calls, i.e. by the next run of a batch.
+    Jobs of a job running on the pool are run sequentially, such that the
+    pool cannot deadlock. If a limiter (see autoscale.MemoryLimiter) is
+    given, each job waits for its admission, i.e. fewer than ``workers``
+    jobs may run concurrently. Exceptions raised by a job are propagated
+    to the caller.
+    """
+    if limiter is not None:
+        func = _limited(func, limiter)
+    if workers <= 1 or getattr(_pool_thread, "in_pool", False):
+        for job in jobs:
+            func(*job)
+        return
+    pool = _shared_pool(workers)
+    futures = [pool.submit(func, *job) for job in jobs]
+    for future in futures:
+        future.result()
+
+
+def _limited(func, limiter):
+    def _run(*job):
+        limiter.acquire()
+        try:
+            func(*job)
+        finally:
+            limiter.release()
+
+    return _run
+
+
+def paginate_score_setups(plot_scores_setup, panels_per_page):
+    """Distribute score setups over pages with a fixed number of panels.
+
+    A change of the categorical threshold, i.e. the ``(...)`` suffix of the
+    first score in a setup, always starts a new page.
+    """
+    pages: list = []
+    prev_threshold = None
+    for score_setup in plot_scores_setup:
+        pattern = re.search(r"\(.*?\)", next(iter(score_setup)))
+        threshold = pattern.group() if pattern is not None else None
+        if (
+            not pages
+            or threshold != prev_threshold
+            or len(pages[-1]) == panels_per_page
+        ):
+            pages.append([])
+        pages[-1].append(score_setup)
+        prev_threshold = threshold
+    return pages
+
+
+# pylint: disable=too-many-arguments
+def figure_spec(
+    plot_type,
+    output,
+    parameter,
+    models,
+    lt_ranges,
+    panels,
+    inputs=(),
+    data_key=None,
+    **style,
+):
+    """Describe one output figure.
+
+    The specification only consists of JSON serialisable types, such that
+    a figure plan can be written to disk and executed elsewhere.
+
+    Args:
+        plot_type (str): station, time, daytime, total or ensemble
+        output (str): file name of the figure within the output directory
+        parameter (str): parameter of the figure (i.e. T_2M)
+        models (list): model versions drawn in the figure
+        lt_ranges (list): lead time ranges drawn in the figure
+        panels (list): one dict per subplot w/ its position [row, col] & scores
+        inputs (list): input files relative to the input directory
+        data_key (str): identifies the input files loaded together
+        style: layout options of the figure
+
+    """
+    return {
+        "plot_type": plot_type,
+        "output": output,
+        "parameter": parameter,
+        "models": list(models),
+        "lt_ranges": list(lt_ranges),
+        "data_key": data_key,
+        "inputs": [str(file) for file in inputs],
+        "panels": panels,
+        "style": style,
+    }
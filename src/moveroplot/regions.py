@@ -0,0 +1,130 @@
+"""Regions of stations, to draw the station maps of a part of a domain.
+
+A region is a polygon of lon/lat points: either the box of --bbox, or a
+named region of the configuration file $XDG_CONFIG_HOME/moveroplot/regions.yaml,
+defined by a box or a polygon, i.e.
+
+    ticino:
+      polygon: [[8.4, 46.6], [9.2, 46.5], [9.2, 45.8], [8.8, 45.8], [8.4, 46.1]]
+    north_east:
+      bbox: [8.5, 10.6, 46.9, 47.8]  # lon_min, lon_max, lat_min, lat_max
+
+The maps of a region show its bounds, and only its stations are drawn.
+"""
+# Standard library
+import os
+from pathlib import Path
+
+# Third-party
+import numpy as np
+import yaml
+from matplotlib.path import Path as PolygonPath
+
+
+def default_regions_file() -> Path:
+    config_dir = os.environ.get("XDG_CONFIG_HOME", Path.home() / ".config")
+    return Path(config_dir) / "moveroplot" / "regions.yaml"
+
+
+def _box(bbox) -> list:
+    lon_min, lon_max, lat_min, lat_max = (float(value) for value in bbox)
+    if lon_min >= lon_max or lat_min >= lat_max:
+        raise ValueError(
+            f"Invalid box {list(bbox)}, expected lon_min,lon_max,lat_min,lat_max."
+        )
+    return [
+        [lon_min, lat_min],
+        [lon_max, lat_min],
+        [lon_max, lat_max],
+        [lon_min, lat_max],
+    ]
+
+
+def parse_bbox(bbox: str) -> dict:
+    """Parse the --bbox input ``lon_min,lon_max,lat_min,lat_max`` into a region."""
+    values = bbox.split(",")
+    if len(values) != 4:
+        raise ValueError(
+            f"Invalid box {bbox!r}, expected lon_min,lon_max,lat_min,lat_max."
+        )
+    return {"name": "bbox", "polygon": _box(values)}
+
+
+def load_regions(regions_file=None) -> dict:
+    """Load the configured regions.
+
+    Args:
+        regions_file (str): YAML file of regions, defaults to
+            $XDG_CONFIG_HOME/moveroplot/regions.yaml (if it exists)
+
+    Returns:
+        dict: name -> region (name and polygon)
+
+    """
+    regions_file = Path(regions_file or default_regions_file())
+    if not regions_file.exists():
+        return {}
+    with open(regions_file, encoding="utf-8") as file:
+        definitions = yaml.safe_load(file) or {}
+    regions = {}
+    for name, definition in definitions.items():
+        if "bbox" in definition:
+            polygon = _box(definition["bbox"])
+        elif len(definition.get("polygon") or []) >= 3:
+            polygon = [[float(lon), float(lat)] for lon, lat in definition["polygon"]]
+        else:
+            raise ValueError(f"Region {name!r} needs a bbox or a polygon.")
+        regions[name] = {"name": name, "polygon": polygon}
+    return regions
+
+
+def select_region(bbox=None, name=None, regions_file=None):
+    """Select the region of the --bbox or --region input.
+
+    Returns:
+        dict: the region, or None if neither is given
+
+    """
+    if bbox is not None and name is not None:
+        raise ValueError("Select either a box (--bbox) or a region (--region).")
+    if bbox is not None:
+        return parse_bbox(bbox)
+    if name is None:
+        return None
+    regions = load_regions(regions_file)
+    if name not in regions:
+        raise ValueError(
+            f"Unknown region {name!r}. Choose from {list(regions)}, "
+            f"or configure it in {default_regions_file()}."
+        )
+    return regions[name]
+
+
+def region_extent(region) -> list:
+    """Lon/lat extent of the region, i.e. of its maps."""
+    lon, lat = np.array(region["polygon"]).T
+    return [float(lon.min()), float(lon.max()), float(lat.min()), float(lat.max())]
+
+
+def region_mask(region, lon, lat):
+    """Which of the stations (lon, lat arrays) are in the region.
+
+    Returns:
+        np.ndarray: boolean mask of the stations
+
+    """
+    lon_min, lon_max, lat_min, lat_max = region_extent(region)
+    # the bounds are checked first, for all stations at once
+    inside = (lon >= lon_min) & (lon <= lon_max) & (lat >= lat_min) & (lat <= lat_max)
+    if not _is_box(region["polygon"]):
+        candidates = np.flatnonzero(inside)
+        inside[candidates] = PolygonPath(region["polygon"]).contains_points(
+            np.column_stack([lon[candidates], lat[candidates]])
+        )
+    return inside
+
+
+def _is_box(polygon) -> bool:
+    lons = {lon for lon, _ in polygon}
+    lats = {lat for _, lat in polygon}
+    return len(polygon) == 4 and len(lons) == 2 and len(lats) == 2
@@ -0,0 +1,234 @@
+"""Serve the figures of a plan over HTTP, rendering each one on first request.
+
+The server is started with the options of a regular run, but renders a
+figure only when it is requested, at
+
+    /<plot type>/<model>+<model>.../<output name of the figure>
+
+i.e. ``/station/C-1E_ch+C-1E-CTR_ch/station_scores_T_2M_19-24_ME.png``.
+``/`` lists the URLs of all figures of the plan as JSON.
+
+Rendered images are kept in a LRU cache in memory and in a cache directory
+on disk, keyed by the fingerprint of the figure (see journal). Thus an
+image is rendered again as soon as one of its input files changes.
+"""
+# Standard library
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote
+
+# Local
+from .figure_plan import load_plan_data
+from .figure_plan import render_spec
+from .journal import figure_fingerprints
+
+
+def figure_url(spec) -> str:
+    return f"/{spec['plot_type']}/{'+'.join(spec['models'])}/{spec['output']}"
+
+
+def default_cache_dir() -> Path:
+    cache_dir = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_dir) / "moveroplot" / "figures"
+
+
+def _touch(path):
+    """Mark a file as recently used (w/ the full resolution of the clock)."""
+    now = time.time_ns()
+    try:
+        os.utime(path, ns=(now, now))
+    except FileNotFoundError:
+        pass
+
+
+class ImageCache:
+    """LRU cache of images in memory, backed by a LRU cache directory.
+
+    Args:
+        cache_dir (str): directory of the disk cache
+        memory_mb (float): size of the memory cache in MiB
+        disk_mb (float): size of the disk cache in MiB
+
+    """
+
+    def __init__(self, cache_dir, memory_mb=256, disk_mb=2048):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_bytes = memory_mb * 1024**2
+        self.disk_bytes = disk_mb * 1024**2
+        self._images: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        path = self.cache_dir / f"{key}.png"
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+        if image is None:
+            try:
+                image = path.read_bytes()
+            except FileNotFoundError:
+                return None
+            self._keep(key, image)
+        _touch(path)
+        return image
+
+    def put(self, key, image):
+        self._keep(key, image)
+        temp_path = self.cache_dir / f".{key}.{threading.get_ident()}.tmp"
+        temp_path.write_bytes(image)
+        os.replace(temp_path, self.cache_dir / f"{key}.png")
+        _touch(self.cache_dir / f"{key}.png")
+        self._evict_from_disk()
+
+    def _keep(self, key, image):
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            size = sum(len(cached) for cached in self._images.values())
+            while size > self.memory_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                size -= len(evicted)
+
+    def _evict_from_disk(self):
+        files = []
+        for path in self.cache_dir.glob("*.png"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, path))
+        size = sum(file_size for _, file_size, _ in files)
+        for _, file_size, path in sorted(files):
+            if size <= self.disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            size -= file_size
+
+
+class _FigureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, compile_plan, input_dir, cache):
+        super().__init__(address, _FigureHandler)
+        self.compile_plan = compile_plan
+        self.input_dir = input_dir
+        self.cache = cache
+        self.plan = compile_plan()
+        self._plan_lock = threading.Lock()
+        self._render_locks: dict = {}
+
+    def urls(self):
+        """Recompile the plan and list the URLs of its figures."""
+        with self._plan_lock:
+            self.plan = self.compile_plan()
+            return [figure_url(spec) for spec in self.plan]
+
+    def find_spec(self, url):
+        """Find the figure of the URL, recompiling the plan for new files."""
+        for recompile in (False, True):
+            with self._plan_lock:
+                if recompile:
+                    self.plan = self.compile_plan()
+                for spec in self.plan:
+                    if figure_url(spec) == url:
+                        return spec, self.plan
+        return None, None
+
+    def image(self, spec, plan):
+        """Get the image of the figure from the cache, or render it."""
+        data_key_plan = [s for s in plan if s["data_key"] == spec["data_key"]]
+        key = figure_fingerprints(data_key_plan, self.input_dir)[spec["output"]]
+        with self._plan_lock:
+            render_lock = self._render_locks.setdefault(key, threading.Lock())
+        # concurrent requests of a figure render it once
+        try:
+            with render_lock:
+                image = self.cache.get(key)
+                if image is None:
+                    image = self._render(spec, data_key_plan)
+                    if image is not None:
+                        self.cache.put(key, image)
+        finally:
+            with self._plan_lock:
+                self._render_locks.pop(key, None)
+        return image
+
+    def _render(self, spec, data_key_plan):
+        plan_data = load_plan_data(data_key_plan, self.input_dir)
+        with tempfile.TemporaryDirectory() as render_dir:
+            render_spec(spec, plan_data, render_dir)
+            figure_path = Path(render_dir) / spec["output"]
+            # no figure is saved if there is no valid data
+            return figure_path.read_bytes() if figure_path.exists() else None
+
+
+class _FigureHandler(BaseHTTPRequestHandler):
+    server: _FigureServer
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        url = unquote(self.path.split("?", maxsplit=1)[0])
+        if url == "/":
+            urls = self.server.urls()
+            self._send(json.dumps(urls, indent=2).encode(), "application/json")
+            return
+        spec, plan = self.server.find_spec(url)
+        if spec is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "No such figure in the plan")
+            return
+        try:
+            image = self.server.image(spec, plan)
+        except Exception as error:  # pylint: disable=broad-except
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, str(error))
+            return
+        if image is None:
+            self.send_error(HTTPStatus.NOT_FOUND, "No valid data for the figure")
+            return
+        self._send(image, "image/png")
+
+    def _send(self, body, content_type):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve_figures(
+    compile_plan,
+    input_dir,
+    port,
+    host="127.0.0.1",
+    cache_dir=None,
+    memory_mb=256,
+    disk_mb=2048,
+):
+    """Serve the figures of the plan, rendered on demand.
+
+    Args:
+        compile_plan (callable): returns the figure plan, called again to
+            discover new input files
+        input_dir (str): directory to seasons (i.e. /scratch/osm/movero/wd)
+        port (int): port of the server
+        host (str): address of the server
+        cache_dir (str): disk cache of the images
+        memory_mb (float): size of the memory cache in MiB
+        disk_mb (float): size of the disk cache in MiB
+
+    """
+    cache = ImageCache(cache_dir or default_cache_dir(), memory_mb, disk_mb)
+    with _FigureServer((host, port), compile_plan, input_dir, cache) as server:
+        print(f"--- serving figures on http://{host}:{server.server_port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -1,6 +1,9 @@
 # pylint: skip-file
 # relevant imports for parsing pipeline
 # Standard library
+import json
+import threading
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 
@@ -8,18 +11,40 @@ from pathlib import Path
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection
+from matplotlib.collections import PolyCollection
+from matplotlib.transforms import Bbox
 
 # relevant imports for plotting pipeline
-import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
 
 from cartopy.mpl.gridliner import LATITUDE_FORMATTER
 from cartopy.mpl.gridliner import LONGITUDE_FORMATTER
-from netCDF4 import Dataset
 
 # First-party
-from moveroplot.load_files import load_relevant_files
+from moveroplot.cell_aggregation import aggregate_stations
+from moveroplot.domains import domain_projection
+from moveroplot.domains import domain_size_px
+from moveroplot.domains import load_domains
+from moveroplot.domains import select_domain
+from moveroplot.geo_features import clip_features
+from moveroplot.geo_features import default_feature_dir
+from moveroplot.geo_features import features_key
+from moveroplot.geo_features import load_features
+from moveroplot.geo_features import prepare_features
+from moveroplot.geo_features import store_features
+from moveroplot.load_files import index_relevant_files
+from moveroplot.map_background import background_key
+from moveroplot.map_background import cached_background
+from moveroplot.map_background import default_background_dir
+from moveroplot.plotting import figure_spec
 from moveroplot.plotting import get_total_dates_from_headers
+from moveroplot.plotting import new_figure
+from moveroplot.plotting import new_subplots
+from moveroplot.regions import region_extent
+from moveroplot.regions import region_mask
+from moveroplot.topography import read_topography
 
 # Local
 # local
@@ -29,9 +54,39 @@ from .utils.parse_plot_synop_ch import station_score_range
 from .utils.scores_lists_settings import unit_number_scores, unitless_scores, _determine_cmap_and_bounds
 from .utils.FBI_scores_settings import param_score_range_fbi, _forward, _inverse, _forward_spec,     _inverse_spec, fbi_custom_ticks
 
-# Module-level cache for pre-rendered map background images.
-# Key: (extent_tuple, topography_path_or_None), Value: (rgba_array, xlim, ylim)
+# Module-level cache for pre-rendered map background images, backed by the
+# persistent cache of map_background.
+# Key: background_key(...), Value: (rgba_array, xlim, ylim)
 _background_cache = {}
+# Geographic features drawn by _add_geographic_features.
+_BACKGROUND_FEATURES = (
+    "coastline",
+    "borders",
+    "ocean",
+    "lakes",
+    "rivers",
+    "lakes_europe_10m",
+)
+# Serialises background rendering when figures are drawn on several threads.
+_background_lock = threading.Lock()
+# Idle map figures, reused by figures of the same layout. The layouts are
+# kept in the order of their last use, at most MAP_FIGURE_POOL_SIZE figures.
+# Key: (num_rows, num_cols, domain_json, topography), Value: [_MapFigure]
+_map_figure_pool = {}
+_map_figure_lock = threading.Lock()
+# idle figures kept for the next figures, i.e. the next runs of a batch or
+# of the daemon
+MAP_FIGURE_POOL_SIZE = 16
+# Station coordinates projected into the map projection, at most
+# STATION_XY_CACHE_SIZE station sets in the order of their last use.
+# Key: (proj4 of the projection, lon bytes, lat bytes), Value: (x, y)
+STATION_XY_CACHE_SIZE = 64
+_station_xy_cache: OrderedDict = OrderedDict()
+_station_xy_lock = threading.Lock()
+# Gridlines of the maps of a domain, projected into the map projection.
+# Key: domain_json, Value: [(segments, line style)]
+_gridline_cache = {}
+_gridline_lock = threading.Lock()
 
 
 def _calculate_figsize(num_rows, num_cols, single_plot_size=(8, 6), padding=(2, 2)):
@@ -52,56 +107,156 @@ def _calculate_figsize(num_rows, num_cols, single_plot_size=(8, 6), padding=(2,
     return (total_width, total_height)
 
 
-def _initialize_plots(labels: list, scores: list, plot_setup: dict, topography=None):
-    num_cols = len(labels)
-    num_rows = len(scores)
-    figsize = _calculate_figsize(num_rows, num_cols, (7.3, 5), (0, 2))
+def prepare_map_features(feature_dir=None):
+    """Prepare the geographic features of all map domains (see geo_features).
 
-    projection = ccrs.RotatedPole(pole_longitude=-170, pole_latitude=43)
+    Args:
+    - feature_dir: Directory of the prepared features, defaults to
+      ~/.cache/moveroplot/features.
+
+    """
+    feature_dir = feature_dir or default_feature_dir()
+    features = {
+        name: feature for name, (feature, _) in _geographic_features().items()
+    }
+    for name, domain in load_domains().items():
+        projection, size_px = domain_projection(domain), domain_size_px(domain)
+        key = features_key(domain["extent"], projection, size_px, features)
+        store_features(
+            feature_dir,
+            key,
+            prepare_features(features, domain["extent"], projection, size_px),
+        )
+        print(f"--- prepared the map features of domain {name} in {feature_dir}")
+
+
+def _initialize_plots(num_rows: int, num_cols: int, domain, topography=None):
+    figsize = _calculate_figsize(num_rows, num_cols, domain["panel_size"], (0, 2))
 
-    # Determine map extent from model version (same logic as before; last match wins)
-    extent = None
-    if "ch" in plot_setup["model_versions"][0][0]:
-        extent = [5.8, 10.6, 45.75, 47.8]
-    if "alps" in plot_setup["model_versions"][0][0]:
-        extent = [0.7, 16.5, 42.3, 50]
+    projection = domain_projection(domain)
 
     # Pre-render (or retrieve from cache) the map background image
-    bg_rgba = bg_xlim = bg_ylim = None
-    if extent is not None:
-        bg_rgba, bg_xlim, bg_ylim = _get_map_background(
-            extent, topography, projection
-        )
+    bg_rgba, bg_xlim, bg_ylim = _get_map_background(domain, topography)
 
-    fig, axes = plt.subplots(
+    fig, axes = new_subplots(
         subplot_kw=dict(projection=projection),
         nrows=num_rows,
         ncols=num_cols,
         tight_layout=True,
         figsize=figsize,
-        dpi=100,
+        dpi=domain["dpi"],
         squeeze=False,
     )
     for ax in axes.ravel():
-        if extent is not None:
-            ax.set_extent(extent, crs=ccrs.PlateCarree())
-            # Stamp the cached background image onto every subplot
-            assert bg_rgba is not None and bg_xlim is not None and bg_ylim is not None
-            ax.imshow(
-                bg_rgba,
-                extent=[bg_xlim[0], bg_xlim[1], bg_ylim[0], bg_ylim[1]],
-                origin='upper',
-                interpolation='bilinear',
-                zorder=9,
-                transform=projection,
-            )
-        _add_gridlines(ax)
+        ax.set_extent(domain["extent"], crs=ccrs.PlateCarree())
+        # Stamp the cached background image onto every subplot
+        ax.imshow(
+            bg_rgba,
+            extent=[bg_xlim[0], bg_xlim[1], bg_ylim[0], bg_ylim[1]],
+            origin='upper',
+            interpolation='bilinear',
+            zorder=9,
+            transform=projection,
+        )
+        # the frame of the map (below the gridlines), the image would cover it
+        ax.spines["geo"].set_zorder(10)
+        # vector lines on top of the background, computed once per domain
+        for segments, style in _domain_gridlines(domain):
+            ax.add_collection(LineCollection(segments, **style))
+        _add_gridlines(ax, lines=False)
     fig.tight_layout(w_pad=8, h_pad=2, rect=(0.05, 0.05, 0.90, 0.90))
-    plt.subplots_adjust(bottom=0.15)
+    fig.subplots_adjust(bottom=0.15)
     return fig, axes
 
 
-def _add_plot_text(ax, data, score, ltr):
+class _MapFigure:
+    """Figure of station score maps which is reused for the next figures.
+
+    The projection, extent, background and gridlines of the maps are set up
+    once per layout. Between figures, only what a figure adds before it is
+    saved (scatters, colorbars and texts) is removed again, and the layout
+    is reset to the one of a new figure.
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        num_rows, num_cols, domain, topography = layout
+        self.fig, self.axes = _initialize_plots(
+            num_rows,
+            num_cols,
+            domain=json.loads(domain),
+            topography=topography,
+        )
+        self._map_axes = list(self.fig.axes)
+        self._subplotpars = {
+            name: getattr(self.fig.subplotpars, name)
+            for name in ("left", "right", "bottom", "top", "wspace", "hspace")
+        }
+        # stations outside the view of the maps are not drawn
+        ax = self._map_axes[0]
+        self.view = [list(ax.get_xlim()), list(ax.get_ylim())]
+        self._static_artists = set(self._map_artists())
+        self._figure_artists = []
+
+    def _map_artists(self):
+        return [
+            artist
+            for ax in self._map_axes
+            for artist in (*ax.collections, *ax.texts)
+        ]
+
+    def save(self, path):
+        self._figure_artists = [
+            artist
+            for artist in self._map_artists()
+            if artist not in self._static_artists
+        ] + [ax for ax in self.fig.axes if ax not in self._map_axes]
+        self.fig.savefig(path)
+
+    def close(self):
+        """Release the artists of the figure, which is not used anymore."""
+        self.fig.clear()
+        self._static_artists = set()
+        self._figure_artists = []
+
+    def reset(self):
+        for artist in self._figure_artists:
+            artist.remove()
+        self._figure_artists = []
+        for ax in self._map_axes:
+            ax.set_title("")
+        # undo the tight layout of the saved figure (incl. its colorbars)
+        self.fig.subplots_adjust(**self._subplotpars)
+
+
+def _checkout_map_figure(num_rows, num_cols, domain, topography=None):
+    layout = (num_rows, num_cols, json.dumps(domain, sort_keys=True), topography)
+    with _map_figure_lock:
+        idle = _map_figure_pool.get(layout)
+        if idle:
+            return idle.pop()
+    return _MapFigure(layout)
+
+
+def _release_map_figure(map_figure):
+    map_figure.reset()
+    evicted = []
+    with _map_figure_lock:
+        idle = _map_figure_pool.pop(map_figure.layout, [])
+        idle.append(map_figure)
+        _map_figure_pool[map_figure.layout] = idle
+        # the figures of the least recently used layouts are dropped
+        num_idle = sum(len(idle) for idle in _map_figure_pool.values())
+        for _ in range(num_idle - MAP_FIGURE_POOL_SIZE):
+            layout = next(iter(_map_figure_pool))
+            evicted.append(_map_figure_pool[layout].pop(0))
+            if not _map_figure_pool[layout]:
+                del _map_figure_pool[layout]
+    for figure in evicted:
+        figure.close()
+
+
+def _add_plot_text(ax, data, score, ltr, stats):
     unit=data["header"]["Unit"][0]
     [subplot_title] = data["header"]["Model version"]
     ax.set_title(f"{subplot_title}: {score}, LT: {ltr}")
@@ -125,11 +280,10 @@ def _add_plot_text(ax, data, score, ltr):
     start_str = start_date.strftime("%Y-%m-%d %H:%M")
     end_str = end_date.strftime("%Y-%m-%d %H:%M")
     
-    row = data["df"].loc[score]
-    valid = row.dropna()
+    score_stats = stats.loc[score]
     # If all values are NaN, write custom text
-    if valid.empty:
-        plt.text(
+    if score_stats["count"] == 0:
+        ax.text(
             0.5,
             -0.03,
             f"""{start_str} to {end_str} -No valid data""",  # noqa: E501
@@ -140,10 +294,10 @@ def _add_plot_text(ax, data, score, ltr):
         )
         return
     
-    min_value = valid.min()
-    min_station = valid.idxmin()
-    max_value = valid.max()
-    max_station = valid.idxmax()
+    min_value = score_stats["min"]
+    min_station = data["df"].columns[int(score_stats["argmin"])]
+    max_value = score_stats["max"]
+    max_station = data["df"].columns[int(score_stats["argmax"])]
 
     # Determine the unit suffix for the footer text
     if any(score.startswith(p) for p in unitless_scores):
@@ -153,7 +307,7 @@ def _add_plot_text(ax, data, score, ltr):
     else:
         unit_suffix = f" {unit}"
 
-    plt.text(
+    ax.text(
         0.5,
         -0.03,
         f"{start_str} to {end_str} "
@@ -167,155 +321,299 @@ def _add_plot_text(ax, data, score, ltr):
     # pylint: enable=line-too-long
 
 
-def _plot_and_save_scores(
-    output_dir,
-    parameter,
-    plot_scores_setup,
-    sup_title,
-    ltr_models_data,
-    plot_setup,
-    topography=None,
+def _map_info(style) -> str:
+    """Part of the file names which tells the maps of a region (or box) and
+    the aggregated maps apart.
+
+    The maps of a whole domain with a marker per station keep their names, the
+    other ones would overwrite them in the same output directory otherwise.
+    """
+    info = ""
+    if style["region"] is not None:
+        info += f"_{style['region']['name']}"
+    if style["aggregation"] is not None:
+        info += f"_{style['aggregation']['shape']}"
+    return info
+
+
+def _figure_specs(
+    parameter, plot_scores_setup, files_index, data_key=None, **style
 ):
-    for ltr, models_data in ltr_models_data.items():
+    if style["layout"] == "lead_times":
+        return _lead_time_figure_specs(
+            parameter, plot_scores_setup, files_index, data_key, **style
+        )
+    specs = []
+    for ltr, model_files in files_index.items():
         ltr_info = f"_{ltr}"
         model_info = (
-            "" if len(models_data.keys()) > 1 else f"_{next(iter(models_data.keys()))}"
+            "" if len(model_files.keys()) > 1 else f"_{next(iter(model_files.keys()))}"
         )
         for scores in plot_scores_setup:
             filename = (
-                f"station_scores_{parameter}{ltr_info}{model_info}")
-            fig, subplot_axes = _initialize_plots(
-                models_data.keys(), scores, plot_setup=plot_setup, topography=topography
+                f"station_scores_{parameter}{ltr_info}{model_info}"
+                + "".join(f"_{score}" for score in scores)
+                + _map_info(style)
             )
-            for idx, score in enumerate(scores):
-                filename += f"_{score}"
-                for model_idx, data in enumerate(models_data.values()):
-                    ax = subplot_axes[idx][model_idx]
-                    ax.get_yaxis().get_major_formatter().set_useOffset(False)
-                    _add_datapoints(
-                        fig=fig,
-                        data=data["df"],
-                        score=score,
-                        ax=ax,
-                        unit=data["header"]["Unit"][0],
-                        param=data["header"]["Parameter"],
-                    )
-
-                    _add_plot_text(ax, data, score, ltr)
-
-            fig.suptitle(
-                sup_title,
-                horizontalalignment="center",
-                verticalalignment="top",
-                fontdict={
-                    "size": 6,
-                    "color": "k",
-                },
-                bbox={"facecolor": "none", "edgecolor": "grey"},
+            panels = [
+                {
+                    "position": [idx, model_idx],
+                    "model": model,
+                    "scores": [score],
+                    "lt_range": ltr,
+                }
+                for idx, score in enumerate(scores)
+                for model_idx, model in enumerate(model_files.keys())
+            ]
+            specs.append(
+                figure_spec(
+                    "station",
+                    f"{filename}.png",
+                    parameter,
+                    model_files.keys(),
+                    [ltr],
+                    panels,
+                    inputs=[file for file in model_files.values() if file],
+                    data_key=data_key,
+                    nrows=len(scores),
+                    ncols=len(model_files),
+                    **style,
+                )
             )
-            fig.savefig(f"{output_dir}/{filename}.png")
-            plt.close()
+    return specs
 
 
-def _generate_station_plots(
-    plot_scores,
-    models_data,
-    parameter,
-    output_dir,
-    plot_setup,
-    debug,
-    topography=None,
+def _lead_time_figure_specs(
+    parameter, plot_scores_setup, files_index, data_key=None, **style
 ):
+    """One figure per score setup, with the maps of all lead time ranges.
+
+    Rows --> Scores & lead time ranges | Columns --> Model versions. The maps
+    of a score share their colour scale and colorbar.
+    """
+    lt_ranges = list(files_index)
+    models = list(
+        dict.fromkeys(model for files in files_index.values() for model in files)
+    )
+    ltr_info = "".join(f"_{ltr}" for ltr in lt_ranges)
+    model_info = "" if len(models) > 1 else f"_{models[0]}"
+    inputs = [
+        file for model_files in files_index.values() for file in model_files.values()
+    ]
+    specs = []
+    for scores in plot_scores_setup:
+        filename = (
+            f"station_scores_{parameter}{ltr_info}{model_info}"
+            + "".join(f"_{score}" for score in scores)
+            + _map_info(style)
+        )
+        panels = [
+            {
+                "position": [idx * len(lt_ranges) + ltr_idx, model_idx],
+                "model": model,
+                "scores": [score],
+                "lt_range": ltr,
+            }
+            for idx, score in enumerate(scores)
+            for ltr_idx, ltr in enumerate(lt_ranges)
+            for model_idx, model in enumerate(models)
+            if model in files_index[ltr]
+        ]
+        specs.append(
+            figure_spec(
+                "station",
+                f"{filename}.png",
+                parameter,
+                models,
+                lt_ranges,
+                panels,
+                inputs=[file for file in inputs if file],
+                data_key=data_key,
+                nrows=len(lt_ranges) * len(scores),
+                ncols=len(models),
+                **style,
+            )
+        )
+    return specs
+
+
+def _sup_title(parameter, ltr_models_data):
     # flat list of unique keys of dicts within models_data dict
     headers = [
-        data["header"] for data in models_data[next(iter(models_data.keys()))].values()
+        data["header"]
+        for data in ltr_models_data[next(iter(ltr_models_data.keys()))].values()
     ]
     total_start_date, total_end_date = get_total_dates_from_headers(headers)
     # pylint: disable=line-too-long
     period_info = f"""{total_start_date.strftime("%Y-%m-%d %H:%M")} - {total_end_date.strftime("%Y-%m-%d %H:%M")} | © MeteoSwiss"""  # noqa: E501
     # pylint: enable=line-too-long
-    sup_title = f"{parameter}: " + period_info
+    return f"{parameter}: " + period_info
 
-    _plot_and_save_scores(
-        output_dir,
-        parameter,
-        plot_scores["regular_scores"],
-        sup_title,
-        models_data,
-        plot_setup,
-        topography=topography,
+
+def _render_figure(spec, ltr_models_data, output_dir, sup_title=None):
+    """Draw and save the figure described by ``spec``."""
+    panels = [
+        panel
+        for panel in spec["panels"]
+        if panel["model"] in ltr_models_data.get(panel["lt_range"], {})
+    ]
+    if not panels:
+        print(f"No valid data found for {spec['output']}")
+        return
+    if sup_title is None:
+        sup_title = _sup_title(spec["parameter"], ltr_models_data)
+    style = spec["style"]
+    # a figure which fails is not reused, as its state is unknown
+    map_figure = _checkout_map_figure(
+        style["nrows"],
+        style["ncols"],
+        domain=style["domain"],
+        topography=style["topography"],
     )
-    _plot_and_save_scores(
-        output_dir,
-        parameter,
-        plot_scores["cat_scores"],
+    fig, subplot_axes = map_figure.fig, map_figure.axes
+    maps = []
+    for panel in panels:
+        [score] = panel["scores"]
+        row, col = panel["position"]
+        ax = subplot_axes[row][col]
+        data = _select_stations(
+            ltr_models_data[panel["lt_range"]][panel["model"]],
+            ax.projection,
+            map_figure.view,
+            style["region"],
+        )
+        maps.append((panel["lt_range"], score, ax, data, _score_stats(data)))
+    # the maps of a score (of all lead time ranges) share their colour scale
+    # and colorbar
+    shared = style["layout"] == "lead_times"
+    score_maps = {}
+    for score_map in maps:
+        score_maps.setdefault(score_map[1], []).append(score_map)
+    value_ranges = {
+        score: _value_range(score_map) if shared else None
+        for score, score_map in score_maps.items()
+    }
+    mappables = {}
+    for ltr, score, ax, data, stats in maps:
+        ax.get_yaxis().get_major_formatter().set_useOffset(False)
+        sc = _add_datapoints(
+            fig=fig,
+            data=data["df"],
+            score=score,
+            ax=ax,
+            unit=data["header"]["Unit"][0],
+            param=data["header"]["Parameter"],
+            stats=stats,
+            aggregation=style["aggregation"],
+            view=map_figure.view,
+            value_range=value_ranges[score],
+            colorbar=not shared,
+        )
+        if sc is not None:
+            mappables[score] = sc
+
+        _add_plot_text(ax, data, score, ltr, stats)
+    if shared:
+        for score, mappable in mappables.items():
+            _, _, _, data, _ = score_maps[score][0]
+            _add_colorbar(
+                fig,
+                mappable,
+                [ax for _, _, ax, _, _ in score_maps[score]],
+                score,
+                data["header"]["Unit"][0],
+                _map_param(data["header"]["Parameter"]),
+            )
+
+    fig.suptitle(
         sup_title,
-        models_data,
-        plot_setup,
-        topography=topography,
+        horizontalalignment="center",
+        verticalalignment="top",
+        fontdict={
+            "size": 6,
+            "color": "k",
+        },
+        bbox={"facecolor": "none", "edgecolor": "grey"},
     )
+    map_figure.save(f"{output_dir}/{spec['output']}")
+    _release_map_figure(map_figure)
 
 
-# enter directory / read station_scores files / call plotting pipeline
+# enter directory / collect station_scores files / compile figure specifications
 # type: ignore
-def _station_scores_pipeline(
+def _plan_figures(
     plot_setup,
     lt_ranges,
-    file_prefix,
-    file_postfix,
     input_dir,
-    output_dir,
-    debug,
+    file_prefix="station_scores",
+    file_postfix=".dat",
     topography=None,
-) -> None:
-    """Read all ```ATAB``` files that are present in: data_dir/season/model_version/<file_prefix><...><file_postfix>.
+    domain=None,
+    region=None,
+    aggregation=None,
+    layout="scores",
+) -> list:
+    """Plan the figures of all ```ATAB``` files present in: data_dir/season/model_version/<file_prefix><...><file_postfix>.
 
-        Extract relevant information (parameters/scores) from these files into a dataframe.
-        Rows --> Scores | Columns --> Stations | For each parameter, a separate station_scores File exists.
+        The files are only collected, not read.
+        Rows --> Scores | Columns --> Model versions | One figure per lead time range and score setup.
 
 
     Args:
+        plot_setup (dict): parsed user input (see parse_inputs)
         lt_ranges (list): lead time ranges, for which plots should be generated (i.e. 01-06, 07-12,...). part of the file name
-        parameters (list): parameters, for which plots should be generated (i.e. CLCT, DD_10M, FF_10M, PMSL,...). part of file name
+        input_dir (str): directory to seasons (i.e. /scratch/osm/movero/wd)
         file_prefix (str): prefix of files (i.e. station_scores)
         file_postfix (str): postfix of files (i.e. ".dat")
-        input_dir (str): directory to seasons (i.e. /scratch/osm/movero/wd)
-        output_dir (str): output directory (i.e. plots/)
-        model_version (str): model_version of interest (i.e. C-1E_ch)
-        scores (list): list of scores, for which plots should be generated
-        relief (bool): passed on to plotting pipeline - add relief to map if True
-        debug (bool): print further comments
+        topography (str): topography file, passed on to the plotting pipeline to add relief to the maps
+        domain (str): map domain (see domains), derived from the model versions if None
+        region (dict): region of the stations to draw (see regions), maps of the whole domain if None
+        aggregation (dict): shape and number of cells the stations are aggregated into (see cell_aggregation),
+            stations are drawn if None
+        layout (str): scores (one figure per lead time range and score setup) or lead_times (one figure per
+            score setup, with the maps of all lead time ranges)
 
-    """  # noqa: E501
-    print("--- initialising station score pipeline")
+    Returns:
+        list: figure specifications (see plotting.figure_spec)
 
+    """  # noqa: E501
     if not lt_ranges:
         lt_ranges = "19-24"
+
+    domains = load_domains()
+    specs = []
     for model_plots in plot_setup["model_versions"]:
         for parameter, scores in plot_setup["parameter"].items():
-            model_data = load_relevant_files(
+            files_index = index_relevant_files(
                 input_dir,
                 file_prefix,
                 file_postfix,
-                debug,
                 model_plots,
                 parameter,
                 lt_ranges,
                 ltr_first=True,
-                transform_func=_station_score_transformation,
             )
-            if not model_data:
+            if not files_index:
                 print(f"No matching files found with given ltr {lt_ranges}")
-                return
-            _generate_station_plots(
-                plot_scores=scores,
-                models_data=model_data,
-                parameter=parameter,
-                output_dir=output_dir,
-                plot_setup=plot_setup,
-                debug=debug,
-                topography=topography,
-            )
+                continue
+            data_key = f"station:{parameter}:{'/'.join(model_plots)}"
+            for plot_scores_setup in (scores["regular_scores"], scores["cat_scores"]):
+                specs.extend(
+                    _figure_specs(
+                        parameter,
+                        plot_scores_setup,
+                        files_index,
+                        data_key,
+                        domain=_map_domain(
+                            select_domain(domains, model_plots[0], domain), region
+                        ),
+                        region=region,
+                        aggregation=aggregation,
+                        layout=layout,
+                        topography=topography,
+                    )
+                )
+    return specs
 
 
 def _station_score_transformation(df, header):
@@ -323,13 +621,159 @@ def _station_score_transformation(df, header):
     df.rename(columns={"ScoreABO": "ABO"}, inplace=True)
     df.loc["lon"] = list(filter(None, header["Longitude"]))
     df.loc["lat"] = list(filter(None, header["Latitude"]))
-    return df
+    # a float frame, whose rows are read as views by the plotting
+    return df.astype(float)
+
+
+def _station_stats(df):
+    """Minimum, maximum, their positions and the number of values of each row.
+
+    The statistics of all rows are computed at once, over the values of the
+    frame. Positions of rows without values are -1.
+
+    Returns:
+        pd.DataFrame: min, max, argmin, argmax and count of each row
+
+    """
+    values = df.to_numpy()
+    if values.shape[1] == 0:
+        values = np.full((len(values), 1), np.nan)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=1)
+    lowest = np.where(valid, values, np.inf)
+    highest = np.where(valid, values, -np.inf)
+    argmin = lowest.argmin(axis=1)
+    argmax = highest.argmax(axis=1)
+    rows = np.arange(len(values))
+    empty = count == 0
+    return pd.DataFrame(
+        {
+            "min": np.where(empty, np.nan, lowest[rows, argmin]),
+            "max": np.where(empty, np.nan, highest[rows, argmax]),
+            "argmin": np.where(empty, -1, argmin),
+            "argmax": np.where(empty, -1, argmax),
+            "count": count,
+        },
+        index=df.index,
+    )
+
+
+def _map_domain(domain, region):
+    """Domain of the maps: the domain itself, or the bounds of the region in it."""
+    if region is None:
+        return domain
+    return {
+        **domain,
+        "name": f"{domain['name']}/{region['name']}",
+        "extent": region_extent(region),
+        # the features prepared for the domain are clipped to the region
+        "parent_extent": domain["extent"],
+    }
+
+
+def _select_stations(data, projection, view, region=None):
+    """Loaded station data reduced to the stations in the view and region.
+
+    Stations which are not drawn are dropped before plotting, i.e. they are
+    neither scattered nor part of the statistics of the maps. The selection
+    is made once per view and region, and kept with the loaded data.
+
+    Args:
+        data (dict): header and df of a station scores file
+        projection (cartopy.crs.Projection): projection of the maps
+        view (list): x and y limits of the maps
+        region (dict): region of the stations (see regions), or None
+
+    Returns:
+        dict: header and df of the selected stations
+
+    """
+    key = json.dumps([projection.proj4_init, view, region])
+    selections = data.setdefault("selections", {})
+    if key not in selections:
+        df = data["df"]
+        x, y = _station_xy(df, projection)
+        (x0, x1), (y0, y1) = view
+        keep = (x >= min(x0, x1)) & (x <= max(x0, x1))
+        keep &= (y >= min(y0, y1)) & (y <= max(y0, y1))
+        if region is not None:
+            keep &= region_mask(
+                region, df.loc["lon"].to_numpy(), df.loc["lat"].to_numpy()
+            )
+        selections[key] = {"header": data["header"], "df": df.loc[:, keep]}
+    return selections[key]
+
 
-def _add_gridlines(ax):
-    """Add gridlines with formatted coordinate labels to a map axis."""
+def _value_range(maps):
+    """Range of the values of the maps (ltr, score, ax, data, stats), or None."""
+    ranges = np.array(
+        [
+            stats.loc[score, ["min", "max"]].to_numpy(dtype=float)
+            for _, score, _, _, stats in maps
+            if score in stats.index
+        ]
+    ).reshape(-1, 2)
+    if np.isnan(ranges).all():
+        return None
+    return {"min": np.nanmin(ranges[:, 0]), "max": np.nanmax(ranges[:, 1])}
+
+
+def _score_stats(data):
+    """Statistics of the rows of loaded station data, computed once per file."""
+    if "stats" not in data:
+        data["stats"] = _station_stats(data["df"])
+    return data["stats"]
+
+
+def _station_xy(data, projection):
+    """Coordinates of the stations of a frame in the map projection.
+
+    The coordinates of a set of stations are projected once per projection,
+    and shared by all maps of the stations.
+
+    Returns:
+        tuple: x and y (read-only arrays, NaN for stations without location)
+
+    """
+    lon = data.loc["lon"].to_numpy()
+    lat = data.loc["lat"].to_numpy()
+    key = (projection.proj4_init, lon.tobytes(), lat.tobytes())
+    with _station_xy_lock:
+        station_xy = _station_xy_cache.get(key)
+        if station_xy is not None:
+            _station_xy_cache.move_to_end(key)
+    if station_xy is None:
+        points = projection.transform_points(ccrs.PlateCarree(), lon, lat)
+        # unprojectable locations are not drawn
+        points[~np.isfinite(points)] = np.nan
+        x, y = points[:, 0].copy(), points[:, 1].copy()
+        x.flags.writeable = y.flags.writeable = False
+        station_xy = x, y
+        with _station_xy_lock:
+            _station_xy_cache[key] = station_xy
+            while len(_station_xy_cache) > STATION_XY_CACHE_SIZE:
+                _station_xy_cache.popitem(last=False)
+    return station_xy
+
+def _add_gridlines(ax, labels=True, lines=True):
+    """Add gridlines with formatted coordinate labels to a map axis.
+
+    Args:
+    - labels: Draw the coordinate labels around the map.
+    - lines: Draw the gridlines, unless they are added from _domain_gridlines.
+
+    """
     gl = ax.gridlines(
-        draw_labels=True, ls="--", lw=0.5, x_inline=False, y_inline=False, zorder=11
+        draw_labels=labels,
+        ls="--",
+        lw=0.5,
+        x_inline=False,
+        y_inline=False,
+        zorder=11,
     )
+    gl.xlines = gl.ylines = lines
+    if not labels:
+        return gl
     gl.top_labels = True
     gl.left_labels = True
     gl.bottom_labels = False
@@ -338,29 +782,90 @@ def _add_gridlines(ax):
     gl.yformatter = LATITUDE_FORMATTER
     gl.xlabel_style = {"rotation": 0}
     gl.ylabel_style = {"rotation": 0}
+    return gl
 
 
-def _add_geographic_features(ax, topography=None):
-    """Add geographic features (coastlines, borders, water bodies, topography) to a map axis."""
-    ax.add_feature(cfeature.COASTLINE, alpha=0.5, rasterized=True, zorder=10)
-    ax.add_feature(
-        cfeature.BORDERS, linestyle="--", alpha=1, rasterized=True, zorder=10
-    )
-    ax.add_feature(cfeature.OCEAN, rasterized=True, zorder=10)
-    ax.add_feature(cfeature.LAKES, alpha=0.5, rasterized=True, zorder=10)
-    ax.add_feature(cfeature.RIVERS, alpha=0.5, rasterized=True, zorder=10)
-    ax.add_feature(
-        cfeature.NaturalEarthFeature(
-            category="physical",
-            name="lakes_europe",
-            scale="10m",
-            rasterized=True,
+def _domain_gridlines(domain):
+    """Gridlines of the maps of a domain, in the map projection.
+
+    The gridlines only depend on the extent and projection of the maps, i.e.
+    cartopy computes and projects them once per domain here.
+
+    Returns:
+        list: segments and style (keyword arguments of LineCollection) of the
+        gridlines along meridians and parallels
+
+    """
+    key = json.dumps(domain, sort_keys=True)
+    with _gridline_lock:
+        gridlines = _gridline_cache.get(key)
+    if gridlines is None:
+        fig = new_figure(figsize=domain["panel_size"], dpi=domain["dpi"])
+        ax = fig.add_axes((0, 0, 1, 1), projection=domain_projection(domain))
+        ax.set_extent(domain["extent"], crs=ccrs.PlateCarree())
+        gl = _add_gridlines(ax, labels=False)
+        fig.canvas.draw()
+        gridlines = []
+        for lines in (*gl.xline_artists, *gl.yline_artists):
+            # the (lon/lat to map) projection part of the transform of the lines
+            projection = lines.get_transform() - ax.transData
+            segments = [
+                segment
+                for path in lines.get_paths()
+                for segment in projection.transform_path(path).to_polygons(
+                    closed_only=False
+                )
+            ]
+            # as drawn by the gridliner (w/ the unscaled dash pattern)
+            style = {**gl.collection_kwargs, "colors": lines.get_edgecolor()}
+            gridlines.append((segments, style))
+        with _gridline_lock:
+            _gridline_cache[key] = gridlines
+    return gridlines
+
+
+def _geographic_features():
+    """Geographic features of the maps and how they are drawn, in drawing order.
+
+    Returns:
+    - dict: name -> (cartopy feature, keyword arguments of add_feature)
+
+    """
+    return {
+        "coastline": (cfeature.COASTLINE, dict(alpha=0.5, rasterized=True, zorder=10)),
+        "borders": (
+            cfeature.BORDERS,
+            dict(linestyle="--", alpha=1, rasterized=True, zorder=10),
         ),
-        alpha=0.5,
-        rasterized=True,
-        color="#97b6e1",
-        zorder=10,
-    )
+        "ocean": (cfeature.OCEAN, dict(rasterized=True, zorder=10)),
+        "lakes": (cfeature.LAKES, dict(alpha=0.5, rasterized=True, zorder=10)),
+        "rivers": (cfeature.RIVERS, dict(alpha=0.5, rasterized=True, zorder=10)),
+        "lakes_europe_10m": (
+            cfeature.NaturalEarthFeature(
+                category="physical",
+                name="lakes_europe",
+                scale="10m",
+                rasterized=True,
+            ),
+            dict(alpha=0.5, rasterized=True, color="#97b6e1", zorder=10),
+        ),
+    }
+
+
+def _add_geographic_features(ax, topography=None, prepared=None):
+    """Add geographic features (coastlines, borders, water bodies, topography) to a map axis.
+
+    Args:
+    - prepared: Geometries of the features prepared for the map domain (see
+      geo_features), drawn instead of the global Natural Earth features.
+
+    """
+    for name, (feature, kwargs) in _geographic_features().items():
+        if prepared is not None and name in prepared:
+            feature = cfeature.ShapelyFeature(
+                prepared[name], ax.projection, **feature.kwargs
+            )
+        ax.add_feature(feature, **kwargs)
     # ax.add_image(ShadedReliefESRI(), 8)
 
     # add ICON-CH1-EPS topography on COSMO-1E grid
@@ -373,11 +878,15 @@ def _add_geographic_features(ax, topography=None):
             )
             return
         try:
-            icon_ch1_eps_topo = Dataset(str(topo_file))
+            # only the window of the map, at (about) its pixel resolution
+            bbox = ax.get_window_extent()
+            topo_x, topo_y, topo_hsurf = read_topography(
+                topo_file, ax.get_xlim(), ax.get_ylim(), (bbox.width, bbox.height)
+            )
             ax.contourf(
-                icon_ch1_eps_topo["x_1"][:].data,
-                icon_ch1_eps_topo["y_1"][:].data,
-                icon_ch1_eps_topo["HSURF"][0, ...].data,
+                topo_x,
+                topo_y,
+                topo_hsurf,
                 cmap="gray_r",
                 levels=np.arange(0, 12000, 500), # do not use entire colormap range
             )
@@ -388,7 +897,7 @@ def _add_geographic_features(ax, topography=None):
             )
 
 
-def _get_map_background(extent, topography, projection):
+def _get_map_background(domain, topography):
     """Get or render a cached RGBA background image with geographic features.
 
     Returns:
@@ -396,15 +905,57 @@ def _get_map_background(extent, topography, projection):
         projection coordinates.
 
     """
-    cache_key = (tuple(extent), topography)
-    if cache_key in _background_cache:
+    extent, projection = domain["extent"], domain_projection(domain)
+    size_px = domain_size_px(domain)
+    features = _BACKGROUND_FEATURES
+    # the maps of a region in a domain are drawn from the features of the domain
+    feature_extent = extent
+    if _contains_extent(domain.get("parent_extent"), extent):
+        feature_extent = domain["parent_extent"]
+    feature_file = default_feature_dir() / (
+        features_key(feature_extent, projection, size_px, _geographic_features())
+        + ".json"
+    )
+    if feature_file.exists():
+        # drawn from the prepared geometries of the domain
+        features += ("prepared",)
+    cache_key = background_key(extent, projection, topography, size_px, features)
+    with _background_lock:
+        if cache_key not in _background_cache:
+            _background_cache[cache_key] = cached_background(
+                default_background_dir(),
+                cache_key,
+                lambda: _render_map_background(domain, topography, feature_file),
+            )
         return _background_cache[cache_key]
 
-    fig_temp = plt.figure(figsize=(7.3, 5), dpi=100)
-    ax_temp = fig_temp.add_axes((0, 0, 1, 1), projection=projection)
-    ax_temp.set_extent(extent, crs=ccrs.PlateCarree())  # type: ignore[union-attr]
 
-    _add_geographic_features(ax_temp, topography)
+def _contains_extent(outer, inner) -> bool:
+    """Check whether a lon/lat extent (or None) contains another one."""
+    if outer is None:
+        return False
+    return (
+        outer[0] <= inner[0]
+        and inner[1] <= outer[1]
+        and outer[2] <= inner[2]
+        and inner[3] <= outer[3]
+    )
+
+
+def _render_map_background(domain, topography, feature_file=None):
+    prepared = None
+    if feature_file is not None:
+        prepared = load_features(feature_file.parent, feature_file.stem)
+    fig_temp = new_figure(figsize=domain["panel_size"], dpi=domain["dpi"])
+    ax_temp = fig_temp.add_axes((0, 0, 1, 1), projection=domain_projection(domain))
+    ax_temp.set_extent(domain["extent"], crs=ccrs.PlateCarree())  # type: ignore[union-attr]
+    if prepared is not None and domain.get("parent_extent") is not None:
+        # features of the parent domain, only the ones of the region are drawn
+        prepared = clip_features(prepared, ax_temp.get_extent())
+
+    # the maps draw their own frame, as vector lines like the gridlines
+    ax_temp.spines["geo"].set_visible(False)
+    _add_geographic_features(ax_temp, topography, prepared)
 
     fig_temp.canvas.draw()
 
@@ -418,17 +969,31 @@ def _get_map_background(extent, topography, projection):
     y0, y1 = h - round(bbox.y1), h - round(bbox.y0)
     rgba = full_rgba[y0:y1, x0:x1].copy()
 
-    result = (rgba, ax_temp.get_xlim(), ax_temp.get_ylim())
-    plt.close(fig_temp)
-    _background_cache[cache_key] = result
-    return result
+    return rgba, ax_temp.get_xlim(), ax_temp.get_ylim()
 
 
-def _add_datapoints(fig, data, score, ax, unit, param):
+def _map_param(param):
     # Workaround since check_params does not work for ATHD_S
     param = "ATHD_S" if param[0] == "ATHD_S" else check_params(param[0])
     if param is None:
         param = "*"
+    return param
+
+
+def _add_datapoints(
+    fig,
+    data,
+    score,
+    ax,
+    unit,
+    param,
+    stats,
+    view,
+    aggregation=None,
+    value_range=None,
+    colorbar=True,
+):
+    param = _map_param(param)
 
     if param in station_score_range.columns and score in station_score_range.index:
         param_score_range = station_score_range[param].loc[score]
@@ -451,13 +1016,27 @@ def _add_datapoints(fig, data, score, ax, unit, param):
     if score not in data.index:
         return
 
-    plot_data = data.loc[["lon", "lat", score]].astype(float)
-    nan_data = plot_data.loc[:, plot_data.isna().any()]
-    plot_data = plot_data.dropna(axis="columns")
+    score_stats = stats.loc[score]
+    x, y = _station_xy(data, ax.projection)
+    values = data.loc[score].to_numpy()
+    located = ~np.isnan(x) & ~np.isnan(y)
+    valid = located & ~np.isnan(values)
+    missing = located & np.isnan(values)
 
+    max_value = score_stats["max"] if value_range is None else value_range["max"]
     cmap, param_score_range = _determine_cmap_and_bounds(
-        param, score, plot_data.loc[score], param_score_range
+        param, score, max_value, param_score_range
     )
+    if value_range is not None:
+        # the colour scale shared by several maps is fixed by all their values
+        param_score_range = {
+            bound: (
+                value_range[bound]
+                if param_score_range[bound] is None
+                else param_score_range[bound]
+            )
+            for bound in ("min", "max")
+        }
 
     norm = None
     if score.startswith("FBI"):
@@ -470,51 +1049,78 @@ def _add_datapoints(fig, data, score, ax, unit, param):
                 vmin=param_score_range["min"], vmax=param_score_range["max"]
             )
 
-    sc = ax.scatter(
-        x=list(plot_data.loc["lon"]),
-        y=list(plot_data.loc["lat"]),
-        marker="o",
-        c=list(plot_data.loc[score]),
-        vmin=param_score_range["min"] if norm is None else None,
-        vmax=param_score_range["max"] if norm is None else None,
-        cmap=cmap,
-        norm=norm,
-        edgecolors="black",
-        linewidth=0.4,
-        rasterized=True,
-        zorder=80,
-        transform=ccrs.PlateCarree(),
-    )
-    if len(plot_data.loc[score]) != 0:
-        max_idx = plot_data.loc[score].idxmax()
-        min_idx = plot_data.loc[score].idxmin()
+    if aggregation is not None:
+        sc = _add_cells(ax, data, score, valid, aggregation, view)
+        sc.set_cmap(cmap)
+        if norm is None:
+            sc.set_clim(param_score_range["min"], param_score_range["max"])
+        else:
+            sc.set_norm(norm)
+    else:
+        # the coordinates are projected already, i.e. not transformed per artist
+        sc = ax.scatter(
+            x=x[valid],
+            y=y[valid],
+            marker="o",
+            c=values[valid],
+            vmin=param_score_range["min"] if norm is None else None,
+            vmax=param_score_range["max"] if norm is None else None,
+            cmap=cmap,
+            norm=norm,
+            edgecolors="black",
+            linewidth=0.4,
+            rasterized=True,
+            zorder=80,
+            transform=ax.projection,
+        )
+    if score_stats["count"] != 0:
+        max_idx = int(score_stats["argmax"])
+        min_idx = int(score_stats["argmin"])
         ax.scatter(
-            x=[plot_data[max_idx].loc["lon"]],
-            y=[plot_data[max_idx].loc["lat"]],
+            x=x[max_idx : max_idx + 1],
+            y=y[max_idx : max_idx + 1],
             marker="+",
             color="black",
             s=80,
             zorder=100,
-            transform=ccrs.PlateCarree(),
+            transform=ax.projection,
         )
         ax.scatter(
-            x=[plot_data[min_idx].loc["lon"]],
-            y=[plot_data[min_idx].loc["lat"]],
+            x=x[min_idx : min_idx + 1],
+            y=y[min_idx : min_idx + 1],
             marker="_",
             color="black",
             s=80,
             zorder=100,
-            transform=ccrs.PlateCarree(),
+            transform=ax.projection,
         )
+    if colorbar:
+        _add_colorbar(fig, sc, [ax], score, unit, param)
+    ax.scatter(
+        x=x[missing],
+        y=y[missing],
+        marker=".",
+        rasterized=True,
+        transform=ax.projection,
+        facecolors="none",
+        edgecolors="black",
+        linewidth=0.5,
+    )
+    return sc
+
+
+def _add_colorbar(fig, sc, axes, score, unit, param):
+    """Add the colorbar of the maps on the right of the axes."""
+    position = Bbox.union([ax.get_position() for ax in axes])
     cax = fig.add_axes(
         [
-            ax.get_position().x1 + 0.005,
-            ax.get_position().y0,
+            position.x1 + 0.005,
+            position.y0,
             0.008,
-            ax.get_position().height,
+            position.height,
         ]
     )
-    cbar = plt.colorbar(sc, cax=cax)
+    cbar = fig.colorbar(sc, cax=cax)
 
     # Only modify ticks for the FBI case
     if score.startswith("FBI"):
@@ -528,14 +1134,44 @@ def _add_datapoints(fig, data, score, ax, unit, param):
         cbar.set_label(f"{score}, (Number)")
     else:
         cbar.set_label(f"{score}, ({unit})")
-    ax.scatter(
-        x=list(nan_data.loc["lon"]),
-        y=list(nan_data.loc["lat"]),
-        marker=".",
-        rasterized=True,
-        transform=ccrs.PlateCarree(),
-        facecolors="none",
+
+
+def _add_cells(ax, data, score, valid, aggregation, view):
+    """Draw the scores of the stations aggregated into cells (see cell_aggregation).
+
+    Args:
+        ax: map axis
+        data (pd.DataFrame): station frame
+        score (str): score of the map
+        valid (np.ndarray): mask of the located stations with a score
+        aggregation (dict): shape (hexbin, grid) and number of cells across a map
+        view (list): x and y limits of the map
+
+    Returns:
+        PolyCollection: the cells, with the mean score of their stations
+
+    """
+    x, y = _station_xy(data, ax.projection)
+    (x0, x1), (y0, y1) = view
+    weights = None
+    if score != "NOBS" and "NOBS" in data.index:
+        weights = data.loc["NOBS"].to_numpy()[valid]
+    polygons, means = aggregate_stations(
+        x[valid],
+        y[valid],
+        data.loc[score].to_numpy()[valid],
+        (x0, x1, y0, y1),
+        aggregation["cells"],
+        aggregation["shape"],
+        weights,
+    )
+    cells = PolyCollection(
+        polygons,
+        array=means,
         edgecolors="black",
-        linewidth=0.5,
+        linewidth=0.4,
+        rasterized=True,
+        zorder=80,
     )
-
+    ax.add_collection(cells)
+    return cells
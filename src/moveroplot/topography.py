@@ -0,0 +1,113 @@
+"""Read the window of a topography file which covers a map, at map resolution.
+
+The topography (``HSURF`` on the ``x_1``/``y_1`` grid of the map projection)
+is read as the hyperslab covering the map only. If the grid is finer than
+the pixels of the map, a downsampled level is used: level ``k`` keeps every
+``2**k``-th grid point. Levels are extracted once per topography file and
+kept in a cache directory, where they are memory mapped from. Thus, the
+memory and the time of drawing the relief depend on the size of the map,
+not on the size of the model grid.
+"""
+# Standard library
+import hashlib
+import math
+import os
+import threading
+from pathlib import Path
+
+# Third-party
+import numpy as np
+from netCDF4 import Dataset
+
+# grid points kept around the window, such that contours reach the border
+MARGIN = 1
+
+
+def default_pyramid_dir() -> Path:
+    cache_dir = os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")
+    return Path(cache_dir) / "moveroplot" / "topography"
+
+
+def _window(coords, limits):
+    """Index range of the (monotonic) coordinates covering the limits."""
+    ascending = coords[0] <= coords[-1]
+    values = coords if ascending else coords[::-1]
+    start = np.searchsorted(values, min(limits), side="right") - 1 - MARGIN
+    stop = np.searchsorted(values, max(limits), side="left") + 1 + MARGIN
+    start, stop = max(int(start), 0), min(int(stop), len(coords))
+    if not ascending:
+        start, stop = len(coords) - stop, len(coords) - start
+    return start, stop
+
+
+def pyramid_level(window_shape, size_px) -> int:
+    """Coarsest level which keeps at least one grid point per pixel."""
+    points_per_pixel = min(
+        window_shape[1] / size_px[0],
+        window_shape[0] / size_px[1],
+    )
+    if points_per_pixel < 2:
+        return 0
+    return int(math.log2(points_per_pixel))
+
+
+def _level_path(topography, level, pyramid_dir) -> Path:
+    stat = Path(topography).stat()
+    identity = f"{Path(topography).resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+    digest = hashlib.sha1(identity.encode()).hexdigest()
+    return Path(pyramid_dir) / digest / f"level_{level}.npy"
+
+
+def _read_level(dataset, topography, level, pyramid_dir):
+    """Memory map a downsampled level, extracting it on first use."""
+    path = _level_path(topography, level, pyramid_dir)
+    try:
+        return np.load(path, mmap_mode="r")
+    except (OSError, ValueError):
+        pass
+    step = 2**level
+    hsurf = np.asarray(dataset["HSURF"][0, ::step, ::step].data)
+    temp_path = path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "wb") as file:
+            np.save(file, hsurf)
+        os.replace(temp_path, path)
+    except OSError as error:
+        temp_path.unlink(missing_ok=True)
+        print(f"Could not store the topography level: {error}")
+    return hsurf
+
+
+def read_topography(topography, xlim, ylim, size_px, pyramid_dir=None):
+    """Read the topography covering a map.
+
+    Args:
+        topography (str): NetCDF file with HSURF on the x_1/y_1 grid
+        xlim (tuple): x limits of the map in the map projection
+        ylim (tuple): y limits of the map in the map projection
+        size_px (tuple): width and height of the map in pixels
+        pyramid_dir (str): cache of the downsampled levels, defaults to
+            ~/.cache/moveroplot/topography
+
+    Returns:
+        tuple: x (1D), y (1D) and surface height (2D) of the window
+
+    """
+    with Dataset(str(topography)) as dataset:
+        x = np.asarray(dataset["x_1"][:].data)
+        y = np.asarray(dataset["y_1"][:].data)
+        i0, i1 = _window(x, xlim)
+        j0, j1 = _window(y, ylim)
+        level = pyramid_level((j1 - j0, i1 - i0), size_px)
+        if level == 0:
+            hsurf = np.asarray(dataset["HSURF"][0, j0:j1, i0:i1].data)
+            return x[i0:i1], y[j0:j1], hsurf
+        step = 2**level
+        hsurf = _read_level(
+            dataset, topography, level, pyramid_dir or default_pyramid_dir()
+        )
+    # window in the coordinates of the level, i.e. of every step-th point
+    i0, i1 = i0 // step, -(-i1 // step)
+    j0, j1 = j0 // step, -(-j1 // step)
+    return x[::step][i0:i1], y[::step][j0:j1], np.array(hsurf[j0:j1, i0:i1])
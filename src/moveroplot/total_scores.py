@@ -1,9 +1,6 @@
 """Calculate total scores from parsed data."""
-# Standard library
-import re
-
 # Third-party
-import matplotlib.pyplot as plt
+import matplotlib as mpl
 import numpy as np
 from matplotlib.lines import Line2D
 
@@ -11,8 +8,11 @@ from matplotlib.lines import Line2D
 from moveroplot.config import plot_settings
 
 # Local
-from .load_files import load_relevant_files
+from .load_files import index_relevant_files
+from .plotting import figure_spec
 from .plotting import get_total_dates_from_headers
+from .plotting import new_subplots
+from .plotting import paginate_score_setups
 
 # pylint: disable=no-name-in-module
 from .utils.parse_plot_synop_ch import cat_total_score_range
@@ -22,7 +22,7 @@ from.utils.scores_lists_settings import unit_number_scores, unitless_scores
 
 # pylint: enable=no-name-in-module
 
-plt.rcParams.update(
+mpl.rcParams.update(
     {
         "axes.titlesize": "medium",
         "axes.labelsize": "small",
@@ -38,63 +38,106 @@ def _total_score_transformation(df, header):
 
 
 # pylint: disable=too-many-arguments,too-many-locals
-# enter directory / read total_scores files / call plotting pipeline
+# enter directory / collect total_scores files / compile figure specifications
 # pylint: disable=pointless-string-statement,too-many-arguments,too-many-locals
-def _total_scores_pipeline(
+def _plan_figures(
     plot_setup,
     lt_ranges,
-    file_prefix,
-    file_postfix,
     input_dir,
-    output_dir,
-    debug,
-) -> None:
+    file_prefix="total_scores",
+    file_postfix=".dat",
+) -> list:
     # pylint: disable=line-too-long
-    """Read all ```ATAB``` files that are present in: data_dir/season/model_version/<file_prefix><...><file_postfix>.
+    """Plan the figures of all ```ATAB``` files present in: data_dir/season/model_version/<file_prefix><...><file_postfix>.
 
-        Extract relevant information (parameters/scores) from these files into a dataframe.
-        Rows --> Scores | Columns --> Stations | For each parameter, a separate station_scores File exists.
+        The files are only collected, not read. Four score setups are assigned
+        per figure, each threshold starts a new figure.
 
 
     Args:
-        parameters (list): parameters, for which plots should be generated (i.e. CLCT, DD_10M, FF_10M, PMSL,...). part of file name
-        file_prefix (str): prefix of files (i.e. time_scores)
-        file_postfix (str): postfix of files (i.e. '.dat')
+        plot_setup (dict): parsed user input (see parse_inputs)
+        lt_ranges (list): lead time ranges, for which plots should be generated (i.e. 01-06, 07-12,...). part of the file name
         input_dir (str): directory to seasons (i.e. /scratch/osm/movero/wd)
-        output_dir (str): output directory (i.e. plots/)
-        model_versions (str): model_versions of interest (i.e. C-1E_ch)
-        scores (list): list of scores, for which plots should be generated
-        debug (bool): print further comments & debug statements
+        file_prefix (str): prefix of files (i.e. total_scores)
+        file_postfix (str): postfix of files (i.e. '.dat')
+
+    Returns:
+        list: figure specifications (see plotting.figure_spec)
 
     """  # noqa: E501
     # pylint: enable=line-too-long
-    print("\n--- initialising total scores pipeline")
-    # tmp; define debug = True, to show debug statements for total_scores only
-    # debug = True
+    specs = []
     for model_plots in plot_setup["model_versions"]:
         for parameter, scores in plot_setup["parameter"].items():
-            model_data = {}
-            model_data = load_relevant_files(
+            files_index = index_relevant_files(
                 input_dir,
                 file_prefix,
                 file_postfix,
-                debug,
                 model_plots,
                 parameter,
                 lt_ranges,
                 ltr_first=False,
-                transform_func=_total_score_transformation,
             )
-            if not model_data:
+            if not files_index:
                 print(f"No matching files found with given ltr {lt_ranges}")
-                return
-            _generate_total_scores_plots(
-                plot_scores=scores,
-                models_data=model_data,
-                parameter=parameter,
-                output_dir=output_dir,
-                debug=debug,
+                continue
+            model_versions = list(files_index.keys())
+            base_filename = (
+                f"total_scores_{model_versions[0]}_{parameter}_"
+                if len(model_versions) == 1
+                else f"total_scores_{parameter}_"
             )
+            data_key = f"total:{parameter}:{'/'.join(model_plots)}"
+            for plot_scores_setup in (scores["regular_scores"], scores["cat_scores"]):
+                specs.extend(
+                    _figure_specs(
+                        base_filename,
+                        parameter,
+                        plot_scores_setup,
+                        files_index,
+                        data_key,
+                    )
+                )
+    return specs
+
+
+def _figure_specs(
+    base_filename, parameter, plot_scores_setup, files_index, data_key=None
+):
+    lt_ranges = sorted(
+        {ltr for ltr_files in files_index.values() for ltr in ltr_files},
+        key=lambda x: int(x.split("-")[0]),
+    )
+    inputs = [
+        file
+        for ltr_files in files_index.values()
+        for file in ltr_files.values()
+        if file
+    ]
+    specs = []
+    for page in paginate_score_setups(plot_scores_setup, 4):
+        filename = base_filename + "".join(
+            f"{score}_" for score_setup in page for score in score_setup
+        )
+        panels = [
+            {"position": [idx // 2, idx % 2], "scores": score_setup}
+            for idx, score_setup in enumerate(page)
+        ]
+        specs.append(
+            figure_spec(
+                "total",
+                f"{filename[:-1]}.png",
+                parameter,
+                files_index.keys(),
+                lt_ranges,
+                panels,
+                inputs=inputs,
+                data_key=data_key,
+                nrows=2,
+                ncols=2,
+            )
+        )
+    return specs
 
 
 # PLOTTING PIPELINE FOR TOTAL SCORES PLOTS
@@ -132,7 +175,7 @@ def _clear_empty_axes_if_necessary(subplot_axes, idx):
 
 
 def _initialize_plots(lines: list[Line2D], labels: list):
-    fig, ((ax0, ax1), (ax2, ax3)) = plt.subplots(
+    fig, ((ax0, ax1), (ax2, ax3)) = new_subplots(
         nrows=2, ncols=2, tight_layout=True, figsize=(10, 10), dpi=200
     )
     fig.legend(
@@ -142,7 +185,7 @@ def _initialize_plots(lines: list[Line2D], labels: list):
         ncol=1,
         frameon=False,
     )
-    plt.tight_layout(w_pad=8, h_pad=3, rect=(0.05, 0.05, 0.90, 0.90))
+    fig.tight_layout(w_pad=8, h_pad=3, rect=(0.05, 0.05, 0.90, 0.90))
     return fig, [ax0, ax1, ax2, ax3]
 
 
@@ -158,8 +201,7 @@ def _save_figure(output_dir, filename, title, fig, axes, idx):
         bbox={"facecolor": "none", "edgecolor": "grey"},
     )
     _clear_empty_axes_if_necessary(axes, idx)
-    fig.savefig(f"{output_dir}/{filename[:-1]}.png")
-    plt.close()
+    fig.savefig(f"{output_dir}/{filename}")
 
 
 def _plot_and_save_scores(
@@ -174,35 +216,61 @@ def _plot_and_save_scores(
 ):
     if debug:
         print("Entering plot_and_save_scores.")
-    if not plot_scores_setup:
+    files_index = {
+        model: dict.fromkeys(ltr_data) for model, ltr_data in models_data.items()
+    }
+    for spec in _figure_specs(base_filename, parameter, plot_scores_setup, files_index):
+        _render_figure(
+            spec,
+            models_data,
+            output_dir,
+            sup_title=sup_title,
+            models_color_lines=models_color_lines,
+        )
+
+
+def _sup_title(parameter, models_data):
+    headers = [
+        data[sorted(list(data.keys()), key=lambda x: int(x.split("-")[0]))[-1]][
+            "header"
+        ]
+        for data in models_data.values()
+    ]
+    total_start_date, total_end_date = get_total_dates_from_headers(headers)
+
+    # pylint: disable=line-too-long
+    period_info = f"""{total_start_date.strftime("%Y-%m-%d")} - {total_end_date.strftime("%Y-%m-%d")} | © MeteoSwiss"""  # noqa: E501
+    # pylint: enable=line-too-long
+    return f"{parameter}: " + period_info
+
+
+def _render_figure(
+    spec, all_models_data, output_dir, sup_title=None, models_color_lines=None
+):
+    """Draw and save the figure described by ``spec``."""
+    parameter = spec["parameter"]
+    models_data = {
+        model: all_models_data[model]
+        for model in spec["models"]
+        if model in all_models_data
+    }
+    if not models_data:
+        print(f"No valid data found for {spec['output']}")
         return
-    filename = base_filename
-    fig, subplot_axes = _initialize_plots(models_color_lines, models_data.keys())
+    if sup_title is None:
+        sup_title = _sup_title(parameter, models_data)
+    if models_color_lines is None:
+        models_color_lines = [
+            Line2D([0], [0], color=plot_settings.modelcolors[model_version], lw=2)
+            for model_version in models_data.keys()
+        ]
 
-    pattern = (
-        re.search(r"\(.*?\)", next(iter(plot_scores_setup))[0])
-        if plot_scores_setup
-        else None
-    )
-    prev_threshold = None
-    if pattern is not None:
-        prev_threshold = pattern.group()
-    current_threshold = prev_threshold
-    current_plot_idx = 0
-    for idx, score_setup in enumerate(plot_scores_setup):
-        prev_threshold = current_threshold
-        pattern = re.search(r"\(.*?\)", next(iter(score_setup)))
-        current_threshold = pattern.group() if pattern is not None else None
-        different_threshold = prev_threshold != current_threshold
-        if different_threshold:
-            _save_figure(
-                output_dir, filename, sup_title, fig, subplot_axes, current_plot_idx - 1
-            )
-            fig, subplot_axes = _initialize_plots(
-                models_color_lines, models_data.keys()
-            )
-            filename = base_filename
-            current_plot_idx += current_plot_idx % 4
+    fig, subplot_axes = _initialize_plots(models_color_lines, models_data.keys())
+    for panel in spec["panels"]:
+        score_setup = panel["scores"]
+        row, col = panel["position"]
+        # get ax, to add plot to
+        ax = subplot_axes[row * 2 + col]
         for model_idx, (key, data) in enumerate(models_data.items()):
             model_plot_color = plot_settings.modelcolors[key]
             # sorted lead time ranges
@@ -213,8 +281,6 @@ def _plot_and_save_scores(
             # extract header from data & create title
             header = data[ltr_sorted[-1]]["header"]
             unit = header["Unit"][0]
-            # get ax, to add plot to
-            ax = subplot_axes[current_plot_idx % 4]
             ax.get_yaxis().get_major_formatter().set_useOffset(False)
             y_label = ",".join(score_setup)
             #ax.setylabel
@@ -233,8 +299,6 @@ def _plot_and_save_scores(
                     Got {len(score_setup)}"""
                 )
             for score_idx, score in enumerate(score_setup):
-                if model_idx == 0:
-                    filename += f"{score}_"
                 y_values = [total_series_by_ltr[ltr].loc[score] for ltr in ltr_sorted]
                 ax.plot(
                     x_int,
@@ -281,71 +345,11 @@ def _plot_and_save_scores(
             ax=ax,
         )
 
-        # save filled figure & re-set necessary for next iteration
-        last_plot = idx == len(plot_scores_setup) - 1
-        figure_full = (current_plot_idx + 1) % 4 == 0
-        if figure_full or last_plot:
-            _save_figure(output_dir, filename, sup_title, fig, subplot_axes, current_plot_idx)
-            if figure_full and not last_plot:
-                fig, subplot_axes = _initialize_plots(models_color_lines, models_data.keys())
-                filename = base_filename
-
-        current_plot_idx += 1
-
-
-def _generate_total_scores_plots(
-    plot_scores,
-    models_data,
-    parameter,
-    output_dir,
-    debug,
-):
-    """Generate Total Score Plots."""
-    model_versions = list(models_data.keys())
-    custom_lines = [
-        Line2D([0], [0], color=plot_settings.modelcolors[model_version], lw=2)
-        for model_version in model_versions
-    ]
-
-    # initialise filename
-    base_filename = (
-        f"total_scores_{model_versions[0]}_{parameter}_"
-        if len(model_versions) == 1
-        else f"total_scores_{parameter}_"
-    )
-    headers = [
-        data[sorted(list(data.keys()), key=lambda x: int(x.split("-")[0]))[-1]][
-            "header"
-        ]
-        for data in models_data.values()
-    ]
-    total_start_date, total_end_date = get_total_dates_from_headers(headers)
-
-    # pylint: disable=line-too-long
-    period_info = f"""{total_start_date.strftime("%Y-%m-%d")} - {total_end_date.strftime("%Y-%m-%d")} | © MeteoSwiss"""  # noqa: E501
-    # pylint: enable=line-too-long
-    sup_title = f"{parameter}: " + period_info
-    if debug:
-        print("Try to generate total score plots.")
-    # plot regular scores
-    _plot_and_save_scores(
-        output_dir,
-        base_filename,
-        parameter,
-        plot_scores["regular_scores"],
-        sup_title,
-        models_data,
-        custom_lines,
-        debug=False,
-    )
-    # plot categorial scores
-    _plot_and_save_scores(
+    _save_figure(
         output_dir,
-        base_filename,
-        parameter,
-        plot_scores["cat_scores"],
+        spec["output"],
         sup_title,
-        models_data,
-        custom_lines,
-        debug=False,
+        fig,
+        subplot_axes,
+        len(spec["panels"]) - 1,
     )
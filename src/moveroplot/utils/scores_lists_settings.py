@@ -14,13 +14,13 @@ unit_number_scores=['N', 'NMOD', 'NOBS']
 def _determine_cmap_and_bounds(
     param,
     score,
-    plot_data,
+    max_value,
     param_score_range,
 ):
     #Set ranges
     if score in ["NOBS"]:
         param_score_range["min"] = 0
-        param_score_range["max"] = np.ceil(plot_data.max())
+        param_score_range["max"] = np.ceil(max_value)
     elif score.startswith(("MOBS")):
         param_score_range = station_score_range[param].loc["MMOD"]
     elif score.startswith("OF"):
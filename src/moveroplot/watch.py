@@ -0,0 +1,82 @@
+"""Poll the input files and re-render the figures depending on changed ones."""
+# Standard library
+import time
+import traceback
+from pathlib import Path
+
+
+def snapshot_inputs(input_dir, model_versions) -> dict:
+    """Size and modification time of the .dat files of the model directories.
+
+    Returns:
+        dict: file path relative to the input directory -> (size, mtime)
+
+    """
+    files = {}
+    for model in model_versions:
+        for path in Path(input_dir, model).glob("*.dat"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files[f"{model}/{path.name}"] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def changed_inputs(previous, current) -> list:
+    """Files which were added, modified or removed between two snapshots."""
+    return sorted(
+        file
+        for file in previous.keys() | current.keys()
+        if previous.get(file) != current.get(file)
+    )
+
+
+def affected_figures(plan, changed) -> list:
+    """Figures of the plan which depend on any of the changed files.
+
+    A figure depends on all input files of its data key (see journal).
+    """
+    changed = set(changed)
+    data_keys = {
+        spec["data_key"] for spec in plan if changed.intersection(spec["inputs"])
+    }
+    return [spec for spec in plan if spec["data_key"] in data_keys]
+
+
+def watch_inputs(render_changed, input_dir, model_versions, poll_seconds=30):
+    """Call render_changed(changed files) whenever input files change.
+
+    Args:
+        render_changed (callable): re-renders the figures depending on the
+            changed files (relative to the input directory)
+        input_dir (str): directory to seasons (i.e. /scratch/osm/movero/wd)
+        model_versions (list): model directories to watch
+        poll_seconds (float): interval between two scans of the files
+
+    Errors of render_changed are printed and the changed files retried by the
+    next scan, they do not stop the watch.
+
+    """
+    previous = snapshot_inputs(input_dir, model_versions)
+    print(f"--- watching {len(previous)} input files, Ctrl-C to stop")
+    try:
+        while True:
+            time.sleep(poll_seconds)
+            current = snapshot_inputs(input_dir, model_versions)
+            changed = changed_inputs(previous, current)
+            if not changed:
+                continue
+            # files still being written are picked up by the next scan
+            print(f"--- {len(changed)} input files changed: {changed}")
+            try:
+                render_changed(changed)
+            except Exception:  # pylint: disable=broad-except
+                # e.g. a truncated file, keep the previous snapshot to retry
+                # the changed files with the next scan
+                traceback.print_exc()
+                print("--- rendering failed, retrying with the next scan")
+                continue
+            previous = current
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,213 @@
+"""Distribute the figures of a plan over workers using a shared directory.
+
+Any number of workers (threads, processes or nodes sharing a filesystem)
+can work on the same queue directory. No coordinator is needed:
+
+- A job is claimed by atomically creating a lease file
+  ``<queue_dir>/leases/<job>.<generation>`` (``O_CREAT | O_EXCL``).
+- While rendering, the worker renews its lease by touching the file.
+  A lease which has not been renewed for ``lease_seconds`` (i.e. its
+  worker crashed) is reclaimed by creating the next generation.
+- A figure is rendered into a private directory and moved into the
+  output directory only if the lease is still current, afterwards the
+  job is marked as done in ``<queue_dir>/done/<job>``. A job without
+  figure (no valid data) is marked as done as well.
+- If rendering fails, the lease is released (i.e. expired), such that the
+  job is reclaimed right away.
+
+Hence every figure is published exactly once. A figure is rendered a
+second time only if its lease expired while it was being rendered.
+A queue directory keeps track of one run; use a new one for each run.
+"""
+# Standard library
+import hashlib
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Local
+from .plotting import run_jobs
+
+LEASE_SECONDS = 300
+
+
+def job_id(spec) -> str:
+    """Identify a figure job by its output name."""
+    return hashlib.sha1(spec["output"].encode()).hexdigest()[:16]
+
+
+def _lease_path(queue_dir, job, generation):
+    return Path(queue_dir) / "leases" / f"{job}.{generation}"
+
+
+def _is_done(queue_dir, job):
+    return (Path(queue_dir) / "done" / job).exists()
+
+
+def _is_stale(lease_path, lease_seconds):
+    try:
+        return time.time() - lease_path.stat().st_mtime > lease_seconds
+    except FileNotFoundError:
+        return False
+
+
+def claim(queue_dir, job, lease_seconds=LEASE_SECONDS):
+    """Try to claim a job.
+
+    Returns:
+        Path: the lease file, or None if the job is leased by another worker
+
+    """
+    generation = 0
+    while True:
+        lease_path = _lease_path(queue_dir, job, generation)
+        try:
+            file_descriptor = os.open(lease_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if _lease_path(queue_dir, job, generation + 1).exists():
+                generation += 1
+            elif _is_stale(lease_path, lease_seconds):
+                # try to take over the expired lease w/ the next generation
+                generation += 1
+            else:
+                return None
+            continue
+        with os.fdopen(file_descriptor, "w") as lease_file:
+            lease_file.write(f"{socket.gethostname()}:{os.getpid()}\n")
+        return lease_path
+
+
+def is_current(lease_path) -> bool:
+    """Check that a lease has not been taken over by another worker."""
+    job, generation = lease_path.name.rsplit(".", maxsplit=1)
+    next_lease = _lease_path(lease_path.parent.parent, job, int(generation) + 1)
+    return not next_lease.exists()
+
+
+@contextmanager
+def _renewed(lease_path, lease_seconds):
+    """Renew the lease in the background while the block is executed."""
+    stop = threading.Event()
+
+    def _renew():
+        while not stop.wait(lease_seconds / 3):
+            try:
+                os.utime(lease_path)
+            except FileNotFoundError:
+                return
+
+    renewer = threading.Thread(target=_renew, daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+
+
+def _publish(queue_dir, job, lease_path, render_dir, output_dir, spec):
+    if not is_current(lease_path) or _is_done(queue_dir, job):
+        print(f"Lease of {spec['output']} expired, result discarded.")
+        return False
+    figure_path = Path(render_dir) / spec["output"]
+    published = figure_path.exists()
+    # no figure is saved if there is no valid data, the job is done anyway
+    if published:
+        os.replace(figure_path, Path(output_dir) / spec["output"])
+    (Path(queue_dir) / "done" / job).touch()
+    return published
+
+
+def _release(lease_path):
+    """Expire a lease, such that its job is reclaimed by the next worker."""
+    try:
+        os.utime(lease_path, (0, 0))
+    except FileNotFoundError:
+        pass
+
+
+def run_worker(
+    plan,
+    queue_dir,
+    output_dir,
+    render,
+    workers=1,
+    lease_seconds=LEASE_SECONDS,
+    poll_seconds=None,
+    limiter=None,
+):
+    """Render figures of the plan until every job of the queue is done.
+
+    Args:
+        plan (list): figure specifications (see plotting.figure_spec)
+        queue_dir (str): directory shared by all workers of the queue
+        output_dir (str): directory of the figures
+        render (callable): render(spec, output_dir) draws and saves a figure
+        workers (int): number of threads claiming jobs in this process
+        lease_seconds (float): leases not renewed for this long are reclaimed
+        poll_seconds (float): pause if all pending jobs are leased by others
+        limiter (MemoryLimiter): admits a thread to claim its next job
+
+    Returns:
+        int: number of figures published by this process
+
+    """
+    if poll_seconds is None:
+        poll_seconds = min(lease_seconds / 3, 5)
+    for sub_dir in ("leases", "done"):
+        Path(queue_dir, sub_dir).mkdir(parents=True, exist_ok=True)
+    jobs = {job_id(spec): spec for spec in plan}
+    pending_lock = threading.Lock()
+    pending = list(jobs)
+    published = []
+
+    def _next_job():
+        """Claim the next pending job, None once all jobs are done."""
+        while True:
+            with pending_lock:
+                for job in list(pending):
+                    if _is_done(queue_dir, job):
+                        pending.remove(job)
+                        continue
+                    lease_path = claim(queue_dir, job, lease_seconds)
+                    if lease_path is not None:
+                        pending.remove(job)
+                        return job, lease_path
+                if not pending:
+                    return None
+            # the remaining jobs are leased by other workers
+            time.sleep(poll_seconds)
+
+    def _work():
+        render_dir = tempfile.mkdtemp(prefix=".queue-", dir=output_dir)
+        try:
+            while True:
+                if limiter is not None:
+                    limiter.acquire()
+                try:
+                    claimed = _next_job()
+                    if claimed is None:
+                        return
+                    job, lease_path = claimed
+                    spec = jobs[job]
+                    try:
+                        with _renewed(lease_path, lease_seconds):
+                            render(spec, render_dir)
+                    except BaseException:
+                        _release(lease_path)
+                        raise
+                finally:
+                    if limiter is not None:
+                        limiter.release()
+                if _publish(queue_dir, job, lease_path, render_dir, output_dir, spec):
+                    published.append(job)
+        finally:
+            shutil.rmtree(render_dir, ignore_errors=True)
+
+    run_jobs(_work, [()] * workers, workers)
+    return len(published)
@@ -0,0 +1,17 @@
+"""Fixtures shared by the tests of the station score maps."""
+import pytest
+
+from moveroplot import station_scores
+from moveroplot.domains import load_domains
+
+
+@pytest.fixture
+def blank_domain(tmp_path, monkeypatch):
+    """The ch domain, with a blank map background (no geographic features)."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setattr(station_scores, "_background_cache", {})
+    monkeypatch.setattr(station_scores, "_map_figure_pool", {})
+    monkeypatch.setattr(station_scores, "_gridline_cache", {})
+    monkeypatch.setattr(station_scores, "_add_geographic_features", lambda *_: None)
+    return load_domains()["ch"]
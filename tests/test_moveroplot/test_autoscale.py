@@ -0,0 +1,28 @@
+"""Test that the number of concurrent jobs follows the memory budget."""
+import time
+
+import numpy as np
+import psutil
+
+from moveroplot.autoscale import MIB
+from moveroplot.autoscale import MemoryLimiter
+from moveroplot.plotting import run_jobs
+
+
+def _job(blocks, idx):
+    # allocate (and touch) 40 MiB for a while
+    blocks[idx] = np.ones(40 * MIB // 8)
+    time.sleep(0.2)
+    blocks[idx] = None
+
+
+def test_workers_scale_within_memory_budget():
+    rss_mb = psutil.Process().memory_info().rss / MIB
+    generous = MemoryLimiter(4, budget_mb=rss_mb + 1000, poll_seconds=0.05)
+    run_jobs(_job, [({}, idx) for idx in range(12)], 4, limiter=generous)
+    assert generous.peak_running > 1
+
+    tight = MemoryLimiter(4, budget_mb=rss_mb + 60, poll_seconds=0.05)
+    run_jobs(_job, [({}, idx) for idx in range(12)], 4, limiter=tight)
+    assert tight.peak_running < generous.peak_running
+    assert tight.running == 0
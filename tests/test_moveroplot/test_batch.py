@@ -0,0 +1,38 @@
+"""Test reading the runs of a batch file."""
+import json
+
+import click
+import pytest
+
+from moveroplot.batch import _run_argv
+from moveroplot.batch import load_batch_file
+from moveroplot.cli import cli
+
+
+def test_batch_runs_are_parsed_like_the_command_line(tmp_path):
+    batch_file = tmp_path / "batch.json"
+    batch = {
+        "defaults": {"input_dir": str(tmp_path), "workers": 2},
+        "runs": [
+            {"model_versions": "C-1E_ch", "plot_params": ["T_2M", "PS"]},
+            {"plot_type": "ensemble", "only": ["*RANK*", "*REL*"], "resume": True},
+        ],
+    }
+    batch_file.write_text(json.dumps(batch))
+    runs = load_batch_file(batch_file)
+    params = [
+        cli.make_context("moveroplot", _run_argv(cli, run)).params for run in runs
+    ]
+    assert params[0]["model_versions"] == "C-1E_ch"
+    assert params[0]["plot_params"] == "T_2M,PS"
+    assert params[0]["workers"] == 2
+    assert params[1]["model_versions"] == "C-1E-CTR_ch,C-1E_ch"
+    assert params[1]["only"] == ("*RANK*", "*REL*")
+    assert params[1]["resume"] and not params[0]["resume"]
+
+
+def test_unknown_batch_option(tmp_path):
+    batch_file = tmp_path / "batch.yaml"
+    batch_file.write_text("- plot_typ: station\n")
+    with pytest.raises(click.BadParameter):
+        _run_argv(cli, load_batch_file(batch_file)[0])
@@ -0,0 +1,36 @@
+"""Test aggregating station scores into map cells."""
+import numpy as np
+import pytest
+
+from moveroplot.cell_aggregation import aggregate_stations
+
+
+def test_grid_cells():
+    x = np.array([0.1, 0.2, 0.9, 0.95])
+    y = np.array([0.1, 0.2, 0.9, 0.3])
+    values = np.array([1.0, 3.0, 5.0, 7.0])
+    polygons, means = aggregate_stations(x, y, values, (0, 1, 0, 1), 2, "grid")
+    assert polygons.shape == (3, 4, 2)
+    np.testing.assert_allclose(polygons[0], [[0, 0], [0.5, 0], [0.5, 0.5], [0, 0.5]])
+    np.testing.assert_allclose(means, [2.0, 7.0, 5.0])
+    # weighted by the number of observations, unless no station has any
+    weights = np.array([1.0, 3.0, np.nan, 0.0])
+    _, means = aggregate_stations(x, y, values, (0, 1, 0, 1), 2, "grid", weights)
+    np.testing.assert_allclose(means, [2.5, 7.0, 5.0])
+
+
+def test_hexagon_cells():
+    rng = np.random.default_rng(1)
+    x, y = rng.uniform(0, 1, 1000), rng.uniform(0, 1, 1000)
+    polygons, means = aggregate_stations(x, y, x, (0, 1, 0, 1), 5)
+    assert polygons.shape[1:] == (6, 2)
+    centers = polygons.mean(axis=1)
+    # each station is in the cell of the nearest center
+    nearest = np.argmin(
+        np.hypot(x[:, None] - centers[:, 0], y[:, None] - centers[:, 1]), axis=1
+    )
+    np.testing.assert_allclose(
+        means, np.bincount(nearest, x) / np.bincount(nearest), rtol=1e-12
+    )
+    with pytest.raises(ValueError):
+        aggregate_stations(x, y, x, (0, 1, 0, 1), 5, "triangles")
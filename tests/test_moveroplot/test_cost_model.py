@@ -0,0 +1,29 @@
+"""Test the prediction of figure runtimes."""
+import pytest
+
+from moveroplot.cost_model import fit_cost_model
+from moveroplot.cost_model import longest_first
+from moveroplot.cost_model import makespan
+from moveroplot.cost_model import predict
+
+
+def test_fit_cost_model():
+    records = [
+        {"kind": "station", "seconds": 1.0 + 2.0 * panels, "panels": panels}
+        | {"models": 2, "input_kb": 10.0 * (panels % 3)}
+        for panels in range(1, 9)
+    ]
+    model = fit_cost_model(records)
+    features = {"panels": 12, "models": 2, "input_kb": 0.0}
+    assert predict(model, "station", features) == pytest.approx(25.0)
+    # unknown kinds fall back to the default of their plot type
+    assert predict(model, "station+topo", features) > predict(model, "total", {})
+
+
+def test_longest_first_makespan():
+    figures = [{"output": f"{idx}.png"} for idx in range(5)]
+    costs = {"0.png": 1, "1.png": 1, "2.png": 1, "3.png": 1, "4.png": 4}
+    ordered = longest_first(figures, costs)
+    assert ordered[0]["output"] == "4.png"
+    assert makespan([costs[spec["output"]] for spec in ordered], 2) == 4
+    assert makespan([costs[spec["output"]] for spec in figures], 2) == 6
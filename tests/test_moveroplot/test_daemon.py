@@ -0,0 +1,49 @@
+"""Test submitting jobs to the daemon."""
+import subprocess
+import sys
+import time
+
+from moveroplot.daemon import is_running
+from moveroplot.daemon import runs_locally
+from moveroplot.daemon import submit
+
+
+def test_submit_to_daemon(tmp_path, capfd):
+    socket_path = tmp_path / "moveroplot.sock"
+    assert submit(socket_path, {}) is None
+
+    # started through the command line, w/o an (existing) --input_dir
+    daemon = subprocess.Popen(
+        [
+            sys.executable,
+            "-c",
+            "from moveroplot.cli import cli; cli()",
+            "--daemon",
+            "--socket",
+            str(socket_path),
+        ]
+    )
+    try:
+        for _ in range(300):
+            if is_running(socket_path):
+                break
+            time.sleep(0.1)
+        exit_code = submit(socket_path, {"plot_type": "nope"})
+        assert exit_code == 1
+        assert "Traceback" in capfd.readouterr().out
+
+        # jobs which never complete are rejected instead of blocking the daemon
+        assert submit(socket_path, {"watch": True}) == 1
+        assert "not run by the daemon" in capfd.readouterr().out
+        assert submit(socket_path, {"serve_http": 0}) == 1
+    finally:
+        daemon.terminate()
+        daemon.wait(timeout=30)
+    assert daemon.returncode == 0
+    assert not socket_path.exists()
+
+
+def test_runs_locally():
+    assert not runs_locally({"watch": False, "serve_http": None})
+    assert runs_locally({"watch": True, "serve_http": None})
+    assert runs_locally({"watch": False, "serve_http": 8000})
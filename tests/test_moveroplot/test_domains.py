@@ -0,0 +1,39 @@
+"""Test the registry of map domains."""
+import pytest
+
+from moveroplot.domains import domain_projection
+from moveroplot.domains import domain_size_px
+from moveroplot.domains import load_domains
+from moveroplot.domains import select_domain
+
+
+def test_configured_domains(tmp_path):
+    domains_file = tmp_path / "domains.yaml"
+    domains_file.write_text(
+        "alps_north:\n"
+        "  extent: [5.5, 13.5, 46.0, 48.5]\n"
+        "  models: [alps_north]\n"
+        "  panel_size: [8, 4]\n"
+    )
+    domains = load_domains(domains_file)
+    assert list(domains) == ["ch", "alps", "alps_north"]
+    alps_north = domains["alps_north"]
+    assert alps_north["projection"] == domains["ch"]["projection"]
+    assert domain_size_px(alps_north) == (800, 400)
+    # the projection is shared by all domains with the same definition
+    assert domain_projection(alps_north) is domain_projection(domains["ch"])
+
+
+def test_select_domain(tmp_path):
+    domains = load_domains(tmp_path / "missing.yaml")
+    assert select_domain(domains, "C-1E_ch")["name"] == "ch"
+    assert select_domain(domains, "C-1E_ch", "alps")["name"] == "alps"
+    with pytest.raises(ValueError, match="Unknown domain"):
+        select_domain(domains, "C-1E_ch", "xy")
+
+
+def test_unknown_model_needs_a_domain(tmp_path):
+    domains = load_domains(tmp_path / "missing.yaml")
+    with pytest.raises(ValueError, match="--domain"):
+        select_domain(domains, "ICON-EU_xy")
+    assert select_domain(domains, "ICON-EU_xy", "alps")["name"] == "alps"
@@ -11,6 +11,7 @@ matplotlib.use("Agg")
 import matplotlib.figure
 import moveroplot.config.plot_settings as plot_settings
 from moveroplot.daytime_scores import _plot_and_save_scores as daytime_plot_and_save
+from moveroplot.plotting import run_jobs
 from moveroplot.time_scores import _plot_and_save_scores as time_plot_and_save
 from moveroplot.total_scores import _plot_and_save_scores as total_plot_and_save
 
@@ -108,3 +109,27 @@ def test_time_scores_closes_all_figures(tmp_path):
     )
 
     assert plt.get_fignums() == [], "time_scores._plot_and_save_scores leaked figures"
+
+
+def test_total_scores_render_on_threads(tmp_path):
+    """Figures drawn concurrently on a thread pool must not touch pyplot."""
+    jobs = [
+        (str(tmp_path), f"total_thread{idx}_", _PARAMETER, _SCORES, "Test")
+        for idx in range(4)
+    ]
+
+    def _render(output_dir, base_filename, parameter, plot_scores_setup, sup_title):
+        total_plot_and_save(
+            output_dir=output_dir,
+            base_filename=base_filename,
+            parameter=parameter,
+            plot_scores_setup=plot_scores_setup,
+            sup_title=sup_title,
+            models_data=_total_models_data(),
+            models_color_lines=[Line2D([0], [0], color="tab:red", lw=2)],
+            debug=False,
+        )
+
+    run_jobs(_render, jobs, workers=4)
+
+    assert plt.get_fignums() == [], "threaded rendering registered pyplot figures"
@@ -0,0 +1,47 @@
+"""Test the compilation of the figure plan."""
+import pytest
+
+from moveroplot.figure_plan import parse_plot_types
+from moveroplot.figure_plan import parse_shard
+from moveroplot.figure_plan import select_figures
+from moveroplot.figure_plan import shard_plan
+from moveroplot.plotting import paginate_score_setups
+
+
+def test_parse_plot_types():
+    assert parse_plot_types("total,daytime") == ["daytime", "total"]
+    assert parse_plot_types("daytime") == ["daytime"]
+    with pytest.raises(ValueError):
+        parse_plot_types("station,spatial")
+
+
+def test_paginate_score_setups():
+    setups = [["ME"], ["MAE"], ["NOBS"], ["FBI(0.1)"], ["POD(0.1)"], ["FBI(1)"]]
+    assert paginate_score_setups(setups, 2) == [
+        [["ME"], ["MAE"]],
+        [["NOBS"]],
+        [["FBI(0.1)"], ["POD(0.1)"]],
+        [["FBI(1)"]],
+    ]
+
+
+def test_shard_plan():
+    plan = [{"output": f"{idx}.png"} for idx in range(7)]
+    shards = [shard_plan(plan, parse_shard(f"{idx}/3")) for idx in (1, 2, 3)]
+    assert sorted(len(shard) for shard in shards) == [2, 2, 3]
+    assert sorted(spec["output"] for shard in shards for spec in shard) == sorted(
+        spec["output"] for spec in plan
+    )
+    for shard in ("0/3", "4/3", "3", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(shard)
+
+
+def test_select_figures():
+    plan = [
+        {"output": "station_scores_T_2M_19-24_ME.png"},
+        {"output": "station_scores_T_2M_07-12_ME.png"},
+        {"output": "time_scores_T_2M_19-24_ME.png"},
+    ]
+    selected = select_figures(plan, ["station_scores_T_2M_19-24*", "time*"])
+    assert selected == [plan[0], plan[2]]
@@ -0,0 +1,70 @@
+"""Test preparing geographic features for a map domain."""
+import cartopy.crs as ccrs
+import cartopy.feature as cfeature
+import numpy as np
+from shapely.geometry import LineString
+
+from moveroplot import station_scores
+from moveroplot.domains import domain_projection
+from moveroplot.domains import domain_size_px
+from moveroplot.domains import load_domains
+from moveroplot.geo_features import clip_features
+from moveroplot.geo_features import features_key
+from moveroplot.geo_features import load_features
+from moveroplot.geo_features import prepare_features
+from moveroplot.geo_features import store_features
+
+
+def test_prepare_store_and_load_features(tmp_path):
+    projection = ccrs.RotatedPole(pole_longitude=-170, pole_latitude=43)
+    extent = [5.8, 10.6, 45.75, 47.8]
+    # a densely sampled line across Europe, and one far away from the domain
+    line = LineString([(lon / 100, 46.5) for lon in range(-1000, 3000)])
+    far = LineString([(100, 0), (101, 1)])
+    features = {"line": cfeature.ShapelyFeature([line, far], ccrs.PlateCarree())}
+
+    prepared = prepare_features(features, extent, projection, (730, 500))
+    [geometry] = prepared["line"]
+    # clipped to the domain and simplified, in the map projection
+    assert len(geometry.coords) < 100
+    x0, _ = projection.transform_point(5.8, 46.5, ccrs.PlateCarree())
+    x1, _ = projection.transform_point(10.6, 46.5, ccrs.PlateCarree())
+    assert x0 - 1 < geometry.bounds[0] < x0 and x1 < geometry.bounds[2] < x1 + 1
+
+    key = features_key(extent, projection, (730, 500), features)
+    assert load_features(tmp_path, key) is None
+    store_features(tmp_path, key, prepared)
+    assert load_features(tmp_path, key)["line"][0].equals(geometry)
+
+
+def test_clip_features():
+    line = LineString([(0, 0), (10, 0)])
+    far = LineString([(0, 5), (10, 5)])
+    clipped = clip_features({"line": [line, far]}, (2, 4, -1, 1))
+    [geometry] = clipped["line"]
+    # clipped w/ a margin of a tenth of the bounds
+    assert geometry.bounds == (1.8, 0, 4.2, 0)
+
+
+def test_region_maps_use_the_features_of_their_domain(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setattr(station_scores, "_background_cache", {})
+    domain = load_domains()["ch"]
+    key = features_key(
+        domain["extent"],
+        domain_projection(domain),
+        domain_size_px(domain),
+        station_scores._geographic_features(),
+    )
+    store_features(tmp_path / "cache" / "moveroplot" / "features", key, {})
+    feature_files = []
+
+    def _render(_domain, _topography, feature_file):
+        feature_files.append(feature_file)
+        return np.zeros((2, 2, 4), dtype=np.uint8), (0.0, 1.0), (0.0, 1.0)
+
+    monkeypatch.setattr(station_scores, "_render_map_background", _render)
+    region = {"name": "west", "polygon": [[6, 46], [7, 46], [7, 47], [6, 47]]}
+    station_scores._get_map_background(station_scores._map_domain(domain, region), None)
+    assert [path.stem for path in feature_files] == [key]
@@ -0,0 +1,67 @@
+"""Test the journal used to resume runs and to rebuild incrementally."""
+from concurrent.futures import ThreadPoolExecutor
+
+from moveroplot.figure_plan import _journaled
+from moveroplot.journal import JOURNAL_NAME
+from moveroplot.journal import completed_figures
+from moveroplot.journal import figure_fingerprints
+from moveroplot.journal import journal_writer
+from moveroplot.journal import read_journal
+from moveroplot.plotting import new_figure
+
+
+def _spec(output, inputs):
+    return {"output": output, "models": [], "data_key": output, "inputs": inputs}
+
+
+def test_only_changed_or_incomplete_figures_are_rendered(tmp_path):
+    input_dir, output_dir = tmp_path / "in", tmp_path / "out"
+    (input_dir / "C-1E_ch").mkdir(parents=True)
+    output_dir.mkdir()
+    inputs = [f"C-1E_ch/scores_{idx}.dat" for idx in range(3)]
+    for file in inputs:
+        (input_dir / file).write_text("data")
+    figures = [_spec(f"figure_{idx}.png", [file]) for idx, file in enumerate(inputs)]
+    fingerprints = figure_fingerprints(figures, input_dir)
+    record = journal_writer(output_dir)
+    for spec in figures:
+        new_figure(figsize=(1, 1)).savefig(output_dir / spec["output"])
+        record(spec["output"], fingerprints[spec["output"]])
+    assert len(completed_figures(figures, output_dir, fingerprints)) == 3
+
+    # a truncated figure and a figure w/ a changed input are rendered again
+    content = (output_dir / "figure_1.png").read_bytes()
+    (output_dir / "figure_1.png").write_bytes(content[:-10])
+    (input_dir / inputs[2]).write_text("new data")
+    fingerprints = figure_fingerprints(figures, input_dir)
+    assert completed_figures(figures, output_dir, fingerprints) == {"figure_0.png"}
+
+
+def test_concurrent_runs_keep_all_entries(tmp_path):
+    def run(idx):
+        # every run compacts the journal when it starts
+        record = journal_writer(tmp_path)
+        for figure in range(5):
+            output = f"figure_{idx}_{figure}.png"
+            new_figure(figsize=(1, 1)).savefig(tmp_path / output)
+            record(output, str(idx))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(run, range(8)))
+    assert len(read_journal(tmp_path)) == 40
+    assert not list(tmp_path.glob(f"{JOURNAL_NAME}.*"))
+
+
+def test_only_figures_saved_by_the_render_are_journaled(tmp_path):
+    # a file of a previous run, which the render does not save (no valid data)
+    new_figure(figsize=(1, 1)).savefig(tmp_path / "stale.png")
+
+    def render(spec, output_dir):
+        if spec["output"] != "stale.png":
+            new_figure(figsize=(1, 1)).savefig(output_dir / spec["output"])
+
+    fingerprints = {"stale.png": "a", "new.png": "b"}
+    render = _journaled(render, journal_writer(tmp_path), fingerprints, tmp_path)
+    for output in fingerprints:
+        render({"output": output}, tmp_path)
+    assert list(read_journal(tmp_path)) == ["new.png"]
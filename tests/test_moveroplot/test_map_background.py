@@ -0,0 +1,57 @@
+"""Test the persistent cache of map backgrounds."""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import cartopy.crs as ccrs
+import numpy as np
+
+from moveroplot.map_background import background_key
+from moveroplot.map_background import cached_background
+from moveroplot.map_background import load_background
+from moveroplot.map_background import store_background
+
+
+def test_background_key(tmp_path):
+    projection = ccrs.RotatedPole(pole_longitude=-170, pole_latitude=43)
+    extent = [5.8, 10.6, 45.75, 47.8]
+    features = ("coastline", "borders")
+    key = background_key(extent, projection, None, (730, 500), features)
+    assert key == background_key(extent, projection, None, (730, 500), features)
+    assert key != background_key(extent, projection, None, (1460, 1000), features)
+    assert key != background_key(extent, ccrs.PlateCarree(), None, (730, 500), features)
+    assert key != background_key(extent, projection, None, (730, 500), features[:1])
+
+    topography = tmp_path / "topo.nc"
+    topography.write_bytes(b"topo")
+    topo_key = background_key(extent, projection, topography, (730, 500), features)
+    assert topo_key != key
+    os.utime(topography, ns=(0, 0))
+    assert topo_key != background_key(
+        extent, projection, topography, (730, 500), features
+    )
+
+
+def test_store_and_load_background(tmp_path):
+    rgba = np.random.default_rng(0).integers(0, 255, (50, 73, 4), dtype=np.uint8)
+    assert load_background(tmp_path, "key") is None
+    store_background(tmp_path, "key", (rgba, (-1.5, 2.0), (-3.0, 4.5)))
+    loaded_rgba, xlim, ylim = load_background(tmp_path, "key")
+    np.testing.assert_array_equal(loaded_rgba, rgba)
+    assert xlim == (-1.5, 2.0) and ylim == (-3.0, 4.5)
+    assert not loaded_rgba.flags.writeable
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["key.json", "key.npy"]
+
+
+def test_cached_background_is_rendered_once(tmp_path):
+    renders = []
+
+    def render():
+        renders.append(1)
+        return np.zeros((5, 7, 4), dtype=np.uint8), (0.0, 1.0), (0.0, 2.0)
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        backgrounds = list(
+            pool.map(lambda _: cached_background(tmp_path, "key", render), range(8))
+        )
+    assert len(renders) == 1
+    assert all(isinstance(rgba, np.memmap) for rgba, _, _ in backgrounds)
@@ -0,0 +1,44 @@
+"""Test that maps on a background have the gridlines of vector maps."""
+import cartopy.crs as ccrs
+import numpy as np
+
+from moveroplot import station_scores
+from moveroplot.domains import domain_projection
+from moveroplot.plotting import new_subplots
+
+
+def _pixels(fig):
+    fig.canvas.draw()
+    return np.array(fig.canvas.buffer_rgba())
+
+
+def _vector_map(domain):
+    fig, axes = new_subplots(
+        subplot_kw=dict(projection=domain_projection(domain)),
+        figsize=station_scores._calculate_figsize(1, 1, domain["panel_size"], (0, 2)),
+        dpi=domain["dpi"],
+        squeeze=False,
+    )
+    axes[0, 0].set_extent(domain["extent"], crs=ccrs.PlateCarree())
+    station_scores._add_gridlines(axes[0, 0])
+    fig.tight_layout(w_pad=8, h_pad=2, rect=(0.05, 0.05, 0.90, 0.90))
+    fig.subplots_adjust(bottom=0.15)
+    return fig
+
+
+def test_gridlines_match_vector_rendering(tmp_path, blank_domain):
+    # a blank background, i.e. only the gridlines are drawn
+    domain = blank_domain
+    expected = _pixels(_vector_map(domain))
+
+    map_figure = station_scores._checkout_map_figure(1, 1, domain)
+    np.testing.assert_array_equal(_pixels(map_figure.fig), expected)
+    # the gridlines are kept when a pooled figure is reused
+    map_figure.save(tmp_path / "map.png")
+    station_scores._release_map_figure(map_figure)
+    assert station_scores._checkout_map_figure(1, 1, domain) is map_figure
+    np.testing.assert_array_equal(_pixels(map_figure.fig), expected)
+
+    # the gridlines are computed once per domain, for all figures of it
+    station_scores._checkout_map_figure(2, 2, domain)
+    assert len(station_scores._gridline_cache) == 1
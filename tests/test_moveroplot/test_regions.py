@@ -0,0 +1,86 @@
+"""Test selecting the stations of regions."""
+import cartopy.crs as ccrs
+import numpy as np
+import pandas as pd
+import pytest
+
+from moveroplot.config import plot_settings
+from moveroplot.journal import figure_fingerprints
+from moveroplot.regions import load_regions
+from moveroplot.regions import region_extent
+from moveroplot.regions import region_mask
+from moveroplot.regions import select_region
+from moveroplot.station_scores import _figure_specs
+from moveroplot.station_scores import _map_domain
+from moveroplot.station_scores import _select_stations
+
+_LON = np.array([7.58, 7.58, 6.13, 8.96, 30.0])
+_LAT = np.array([46.49, 47.54, 46.25, 46.0, 60.0])
+
+
+def test_regions(tmp_path):
+    regions_file = tmp_path / "regions.yaml"
+    regions_file.write_text(
+        "west:\n"
+        "  polygon: [[5.9, 45.8], [7.7, 45.8], [7.7, 47.7], [5.9, 46.6]]\n"
+        "south:\n"
+        "  bbox: [8.5, 10.6, 45.7, 46.3]\n"
+    )
+    regions = load_regions(regions_file)
+    assert list(region_mask(regions["west"], _LON, _LAT)) == [1, 1, 1, 0, 0]
+    assert list(region_mask(regions["south"], _LON, _LAT)) == [0, 0, 0, 1, 0]
+    assert region_extent(regions["south"]) == [8.5, 10.6, 45.7, 46.3]
+    box = select_region(bbox="7,9.5,45.7,47.8")
+    assert list(region_mask(box, _LON, _LAT)) == [1, 1, 0, 1, 0]
+    with pytest.raises(ValueError):
+        select_region(bbox="9.5,7,45.7,47.8")
+    with pytest.raises(ValueError):
+        select_region(name="north", regions_file=regions_file)
+    assert select_region() is None
+
+
+def test_select_stations():
+    df = pd.DataFrame(
+        [np.arange(5.0), _LON, _LAT],
+        index=["ME", "lon", "lat"],
+        columns=["ABO", "BAS", "GVE", "LUG", "FAR"],
+    )
+    data = {"header": {}, "df": df}
+    projection = ccrs.PlateCarree()
+    view = [[5.8, 10.6], [45.75, 47.8]]
+    selected = _select_stations(data, projection, view)
+    assert list(selected["df"].columns) == ["ABO", "BAS", "GVE", "LUG"]
+    # the selection is made once
+    assert _select_stations(data, projection, view) is selected
+    box = select_region(bbox="7,9.5,45.7,47.8")
+    selected = _select_stations(data, projection, view, box)
+    assert list(selected["df"].columns) == ["ABO", "BAS", "LUG"]
+
+
+def test_region_maps_have_their_own_names(tmp_path, monkeypatch, blank_domain):
+    monkeypatch.setattr(plot_settings, "modelcolors", {"C-1E_ch": "red"})
+    files_index = {"07-12": {"C-1E_ch": "C-1E_ch/station_scores07-12_T_2M.dat"}}
+    box = select_region(bbox="7,9.5,45.7,47.8")
+    hexbin = {"shape": "hexbin", "cells": 40}
+    specs = []
+    for region, aggregation in [(None, None), (box, None), (box, hexbin)]:
+        [spec] = _figure_specs(
+            "T_2M",
+            [["ME"]],
+            files_index,
+            data_key="T_2M",
+            domain=_map_domain(blank_domain, region),
+            region=region,
+            aggregation=aggregation,
+            layout="scores",
+            topography=None,
+        )
+        specs.append(spec)
+    assert [spec["output"] for spec in specs] == [
+        "station_scores_T_2M_07-12_C-1E_ch_ME.png",
+        "station_scores_T_2M_07-12_C-1E_ch_ME_bbox.png",
+        "station_scores_T_2M_07-12_C-1E_ch_ME_bbox_hexbin.png",
+    ]
+    # i.e. their journal entries do not match each other either
+    fingerprints = figure_fingerprints(specs, tmp_path)
+    assert len(set(fingerprints.values())) == 3
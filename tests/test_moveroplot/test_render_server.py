@@ -0,0 +1,83 @@
+"""Test the render server and its image cache."""
+import os
+import threading
+import time
+from urllib.request import urlopen
+
+from moveroplot import render_server
+from moveroplot.config import plot_settings
+from moveroplot.plotting import new_figure
+from moveroplot.render_server import ImageCache
+from moveroplot.render_server import figure_url
+from moveroplot.render_server import serve_figures
+
+
+def test_image_cache_evicts_least_recently_used(tmp_path):
+    cache = ImageCache(tmp_path, memory_mb=2.5 / 1024, disk_mb=2.5 / 1024)
+    for key in ("a", "b"):
+        cache.put(key, key.encode() * 1024)
+    assert cache.get("a") == b"a" * 1024
+    cache.put("c", b"c" * 1024)
+    # "b" was used least recently, in memory and on disk
+    assert sorted(path.stem for path in tmp_path.glob("*.png")) == ["a", "c"]
+    assert cache.get("b") is None
+
+    # a new server process still finds the images on disk
+    assert ImageCache(tmp_path).get("c") == b"c" * 1024
+
+
+def test_figures_are_rendered_once_per_input_version(tmp_path, monkeypatch):
+    (tmp_path / "in" / "C-1E_ch").mkdir(parents=True)
+    input_file = tmp_path / "in" / "C-1E_ch" / "time_scores19-24_T_2M.dat"
+    input_file.write_text("data")
+    spec = {
+        "plot_type": "time",
+        "models": ["C-1E_ch"],
+        "output": "time_scores_T_2M_19-24_ME.png",
+        "data_key": "T_2M",
+        "inputs": ["C-1E_ch/time_scores19-24_T_2M.dat"],
+    }
+    renders = []
+
+    def render_spec(spec, _plan_data, output_dir):
+        renders.append(spec["output"])
+        new_figure(figsize=(1, 1)).savefig(os.path.join(output_dir, spec["output"]))
+
+    # the colors of the model versions are set by main
+    monkeypatch.setattr(plot_settings, "modelcolors", {"C-1E_ch": "red"})
+    monkeypatch.setattr(render_server, "load_plan_data", lambda *_: {})
+    monkeypatch.setattr(render_server, "render_spec", render_spec)
+    servers = []
+
+    class _Server(render_server._FigureServer):
+        def __init__(self, *args):
+            super().__init__(*args)
+            servers.append(self)
+
+    monkeypatch.setattr(render_server, "_FigureServer", _Server)
+    thread = threading.Thread(
+        target=serve_figures,
+        args=(lambda: [spec], tmp_path / "in", 0),
+        kwargs={"cache_dir": tmp_path / "cache"},
+    )
+    thread.start()
+    try:
+        while not servers:
+            time.sleep(0.01)
+        url = f"http://127.0.0.1:{servers[0].server_port}{figure_url(spec)}"
+        with urlopen(url) as response:
+            image = response.read()
+        with urlopen(url) as response:
+            assert response.read() == image
+        assert len(renders) == 1
+
+        # a changed input file renders the figure again
+        stat = input_file.stat()
+        os.utime(input_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+        with urlopen(url) as response:
+            assert response.headers["Content-Type"] == "image/png"
+        assert len(renders) == 2
+    finally:
+        if servers:
+            servers[0].shutdown()
+        thread.join(timeout=30)
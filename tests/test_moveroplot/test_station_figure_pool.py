@@ -0,0 +1,77 @@
+"""Test that reused station score figures look like new ones."""
+import pandas as pd
+import pytest
+
+from moveroplot import station_scores
+from moveroplot.station_scores import _figure_specs
+from moveroplot.station_scores import _render_figure
+
+_MODEL = "C-1E_ch"
+
+
+def _ltr_models_data(offset):
+    df = pd.DataFrame(
+        {
+            station: [lon, lat, lon + offset, lat - offset]
+            for station, lon, lat in [("ABO", 7.5, 46.5), ("BAS", 7.6, 47.5)]
+        },
+        index=["lon", "lat", "ME", "MAE"],
+    )
+    header = {
+        "Unit": ["degC"],
+        "Model version": [_MODEL],
+        "Parameter": ["T_2M"],
+        "Start time": ["2024-01-01", "00:00"],
+        "End time": ["2024-01-31", "00:00"],
+    }
+    return {"07-12": {_MODEL: {"df": df, "header": header}}}
+
+
+@pytest.mark.parametrize(
+    "aggregation", [None, {"shape": "hexbin", "cells": 10}], ids=["stations", "hexbin"]
+)
+def test_pooled_figure_matches_new_figure(tmp_path, blank_domain, aggregation):
+    [spec] = _figure_specs(
+        "T_2M",
+        [["ME", "MAE"]],
+        {"07-12": {_MODEL: None}},
+        domain=blank_domain,
+        region=None,
+        aggregation=aggregation,
+        layout="scores",
+        topography=None,
+    )
+    for run, offset in enumerate([0.0, 3.0, 0.0]):
+        output_dir = tmp_path / str(run)
+        output_dir.mkdir()
+        _render_figure(spec, _ltr_models_data(offset), output_dir, sup_title="T")
+    [idle] = station_scores._map_figure_pool.values()
+    [map_figure] = idle
+    # the extent of the maps and the artists of the domain are kept
+    for ax in map_figure.axes.ravel():
+        assert [list(ax.get_xlim()), list(ax.get_ylim())] == map_figure.view
+        assert len(ax.images) == 1
+    new = (tmp_path / "0" / spec["output"]).read_bytes()
+    assert (tmp_path / "1" / spec["output"]).read_bytes() != new
+    # the figure rendered with the reused figure matches the new one
+    assert (tmp_path / "2" / spec["output"]).read_bytes() == new
+
+
+def test_pool_keeps_the_recently_used_figures(monkeypatch, blank_domain):
+    monkeypatch.setattr(station_scores, "MAP_FIGURE_POOL_SIZE", 2)
+    figures = {
+        layout: station_scores._checkout_map_figure(*layout, blank_domain)
+        for layout in [(1, 1), (1, 2), (2, 1)]
+    }
+    for layout in [(1, 1), (1, 2)]:
+        station_scores._release_map_figure(figures[layout])
+    # reusing the figure of (1, 1) makes (1, 2) the least recently used layout
+    assert station_scores._checkout_map_figure(1, 1, blank_domain) is figures[(1, 1)]
+    station_scores._release_map_figure(figures[(1, 1)])
+    station_scores._release_map_figure(figures[(2, 1)])
+    assert [layout[:2] for layout in station_scores._map_figure_pool] == [
+        (1, 1),
+        (2, 1),
+    ]
+    # the evicted figure is closed
+    assert not figures[(1, 2)].fig.axes
@@ -0,0 +1,104 @@
+"""Test the station score figures of all lead time ranges."""
+import pandas as pd
+
+from moveroplot import station_scores
+from moveroplot.station_scores import _figure_specs
+from moveroplot.station_scores import _render_figure
+
+_MODELS = ["C-1E_ch", "C-1E-CTR_ch"]
+
+
+def _models_data(nobs):
+    df = pd.DataFrame(
+        {"ABO": [7.5, 46.5, 1.0, nobs], "BAS": [7.6, 47.5, -1.0, 2 * nobs]},
+        index=["lon", "lat", "ME", "NOBS"],
+    )
+    header = {
+        "Unit": ["degC"],
+        "Parameter": ["T_2M"],
+        "Start time": ["2024-01-01", "00:00"],
+        "End time": ["2024-01-31", "00:00"],
+    }
+    return {
+        model: {"df": df, "header": {**header, "Model version": [model]}}
+        for model in _MODELS
+    }
+
+
+def test_lead_time_figures(tmp_path, monkeypatch, blank_domain):
+    files_index = {
+        "07-12": dict.fromkeys(_MODELS),
+        "19-24": dict.fromkeys(_MODELS[:1]),
+    }
+    specs = _figure_specs(
+        "T_2M",
+        [["ME"], ["NOBS"]],
+        files_index,
+        domain=blank_domain,
+        region=None,
+        aggregation=None,
+        layout="lead_times",
+        topography=None,
+    )
+    assert [spec["output"] for spec in specs] == [
+        "station_scores_T_2M_07-12_19-24_ME.png",
+        "station_scores_T_2M_07-12_19-24_NOBS.png",
+    ]
+    assert [
+        (panel["position"], panel["model"], panel["lt_range"])
+        for panel in specs[1]["panels"]
+    ] == [
+        ([0, 0], _MODELS[0], "07-12"),
+        ([0, 1], _MODELS[1], "07-12"),
+        ([1, 0], _MODELS[0], "19-24"),
+    ]
+    colorbars = []
+    add_colorbar = station_scores._add_colorbar
+
+    def _add_colorbar(fig, sc, axes, *args):
+        colorbars.append((sc.get_clim(), len(axes)))
+        add_colorbar(fig, sc, axes, *args)
+
+    monkeypatch.setattr(station_scores, "_add_colorbar", _add_colorbar)
+    ltr_models_data = {"07-12": _models_data(10.0), "19-24": _models_data(40.0)}
+    _render_figure(specs[1], ltr_models_data, tmp_path, sup_title="T")
+    assert (tmp_path / specs[1]["output"]).exists()
+    # one colorbar for the three maps, on the colour scale of all maps
+    assert colorbars == [((0, 80.0), 3)]
+
+
+def test_lead_time_figure_of_several_scores(tmp_path, monkeypatch, blank_domain):
+    files_index = {"07-12": dict.fromkeys(_MODELS), "19-24": dict.fromkeys(_MODELS)}
+    [spec] = _figure_specs(
+        "T_2M",
+        [["ME", "NOBS"]],
+        files_index,
+        domain=blank_domain,
+        region=None,
+        aggregation=None,
+        layout="lead_times",
+        topography=None,
+    )
+    # the rows of a score are adjacent, such that its colorbar spans them
+    assert [
+        (panel["position"][0], panel["scores"], panel["lt_range"])
+        for panel in spec["panels"][::2]
+    ] == [
+        (0, ["ME"], "07-12"),
+        (1, ["ME"], "19-24"),
+        (2, ["NOBS"], "07-12"),
+        (3, ["NOBS"], "19-24"),
+    ]
+    colorbars = []
+    add_colorbar = station_scores._add_colorbar
+
+    def _add_colorbar(fig, sc, axes, score, *args):
+        rows = sorted({ax.get_subplotspec().rowspan.start for ax in axes})
+        colorbars.append((score, sc.get_clim(), rows))
+        add_colorbar(fig, sc, axes, score, *args)
+
+    monkeypatch.setattr(station_scores, "_add_colorbar", _add_colorbar)
+    ltr_models_data = {"07-12": _models_data(10.0), "19-24": _models_data(40.0)}
+    _render_figure(spec, ltr_models_data, tmp_path, sup_title="T")
+    # one colorbar per score, on the colour scale of the maps of the score
+    assert colorbars == [("ME", (-5.0, 5.0), [0, 1]), ("NOBS", (0, 80.0), [2, 3])]
@@ -0,0 +1,28 @@
+"""Test the statistics of the score rows of station frames."""
+import numpy as np
+import pandas as pd
+
+from moveroplot.station_scores import _station_stats
+
+
+def test_station_stats():
+    df = pd.DataFrame(
+        {
+            "ABO": [1.0, np.nan, 3.0],
+            "BAS": [-2.0, np.nan, 3.0],
+            "GVE": [5.0, np.nan, np.nan],
+        },
+        index=["ME", "MAE", "NOBS"],
+    )
+    stats = _station_stats(df)
+    valid = df.loc[["ME", "NOBS"]]
+    pd.testing.assert_series_equal(
+        stats.loc[["ME", "NOBS"], "min"], valid.min(axis=1), check_names=False
+    )
+    pd.testing.assert_series_equal(
+        stats.loc[["ME", "NOBS"], "max"], valid.max(axis=1), check_names=False
+    )
+    assert list(df.columns[stats.loc[["ME", "NOBS"], "argmin"]]) == ["BAS", "ABO"]
+    assert list(df.columns[stats.loc[["ME", "NOBS"], "argmax"]]) == ["GVE", "ABO"]
+    assert list(stats["count"]) == [3, 0, 2]
+    assert np.isnan(stats.loc["MAE", "min"]) and stats.loc["MAE", "argmax"] == -1
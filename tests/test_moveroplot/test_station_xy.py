@@ -0,0 +1,45 @@
+"""Test projecting the station coordinates once per station set."""
+from collections import OrderedDict
+
+import cartopy.crs as ccrs
+import numpy as np
+import pandas as pd
+
+from moveroplot import station_scores
+from moveroplot.station_scores import _station_xy
+
+
+def test_station_xy(monkeypatch):
+    monkeypatch.setattr(station_scores, "_station_xy_cache", OrderedDict())
+    projection = ccrs.RotatedPole(pole_longitude=-170, pole_latitude=43)
+    data = pd.DataFrame(
+        {"ABO": [1.0, 7.58, 46.49], "BAS": [2.0, np.nan, np.nan]},
+        index=["ME", "lon", "lat"],
+    )
+    x, y = _station_xy(data, projection)
+    expected = projection.transform_point(7.58, 46.49, ccrs.PlateCarree())
+    np.testing.assert_allclose((x[0], y[0]), expected)
+    assert np.isnan(x[1]) and np.isnan(y[1])
+    assert not x.flags.writeable
+    # frames of the same stations share the projected coordinates
+    assert _station_xy(data.copy(), projection)[0] is x
+    assert _station_xy(data, ccrs.PlateCarree())[0] is not x
+
+
+def test_station_xy_cache_size(monkeypatch):
+    monkeypatch.setattr(station_scores, "_station_xy_cache", OrderedDict())
+    monkeypatch.setattr(station_scores, "STATION_XY_CACHE_SIZE", 2)
+    projection = ccrs.PlateCarree()
+    frames = [
+        pd.DataFrame({"ABO": [1.0, lon, 46.49]}, index=["ME", "lon", "lat"])
+        for lon in (6.0, 7.0, 8.0)
+    ]
+    first = _station_xy(frames[0], projection)
+    second = _station_xy(frames[1], projection)
+    # the last used station sets are kept
+    assert _station_xy(frames[0], projection) is first
+    _station_xy(frames[2], projection)
+    assert len(station_scores._station_xy_cache) == 2
+    assert _station_xy(frames[0], projection) is first
+    # the least recently used one is projected again
+    assert _station_xy(frames[1], projection) is not second
@@ -0,0 +1,52 @@
+"""Test reading the window of a topography file."""
+import numpy as np
+from netCDF4 import Dataset
+
+from moveroplot.topography import pyramid_level
+from moveroplot.topography import read_topography
+
+
+def _topography_file(path):
+    x = np.linspace(-4, 4, 801)
+    y = np.linspace(3, -3, 601)  # descending
+    hsurf = np.add.outer(100 * y, x).astype("f4")
+    with Dataset(path, "w") as dataset:
+        dataset.createDimension("time", 1)
+        dataset.createDimension("y_1", len(y))
+        dataset.createDimension("x_1", len(x))
+        dataset.createVariable("x_1", "f8", ("x_1",))[:] = x
+        dataset.createVariable("y_1", "f8", ("y_1",))[:] = y
+        dataset.createVariable("HSURF", "f4", ("time", "y_1", "x_1"))[:] = hsurf[None]
+    return x, y, hsurf
+
+
+def test_pyramid_level():
+    assert pyramid_level((500, 730), (730, 500)) == 0
+    assert pyramid_level((999, 1459), (730, 500)) == 0
+    assert pyramid_level((1000, 1460), (730, 500)) == 1
+    assert pyramid_level((4000, 5840), (730, 500)) == 3
+
+
+def test_read_topography_window(tmp_path):
+    x, y, hsurf = _topography_file(tmp_path / "topo.nc")
+    pyramid_dir = tmp_path / "pyramid"
+
+    # full resolution: the window covers the limits plus a margin
+    window_x, window_y, window = read_topography(
+        tmp_path / "topo.nc", (-1, 1), (-0.5, 0.5), (1000, 1000), pyramid_dir
+    )
+    assert window_x[0] < -1 < 1 < window_x[-1] and len(window_x) == 203
+    assert window_y[0] > 0.5 > -0.5 > window_y[-1] and len(window_y) == 103
+    i0, j0 = np.flatnonzero(x == window_x[0])[0], np.flatnonzero(y == window_y[0])[0]
+    np.testing.assert_array_equal(window, hsurf[j0 : j0 + 103, i0 : i0 + 203])
+    assert not pyramid_dir.exists()
+
+    # downsampled: every 4th point, from a cached level
+    for _ in range(2):
+        window_x, window_y, window = read_topography(
+            tmp_path / "topo.nc", (-4, 4), (-3, 3), (200, 150), pyramid_dir
+        )
+        np.testing.assert_array_equal(window_x, x[::4])
+        np.testing.assert_array_equal(window_y, y[::4])
+        np.testing.assert_array_equal(window, hsurf[::4, ::4])
+    assert [path.name for path in pyramid_dir.glob("*/*")] == ["level_2.npy"]
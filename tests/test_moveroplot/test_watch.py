@@ -0,0 +1,54 @@
+"""Test the mapping of changed input files to figures."""
+from moveroplot import watch
+from moveroplot.load_files import load_input_files
+from moveroplot.watch import affected_figures
+from moveroplot.watch import changed_inputs
+from moveroplot.watch import snapshot_inputs
+
+
+def test_changed_inputs_affect_figures_of_their_data_key(tmp_path):
+    (tmp_path / "C-1E_ch").mkdir()
+    for ltr in ("07-12", "19-24"):
+        (tmp_path / "C-1E_ch" / f"time_scores{ltr}_T_2M.dat").write_text("data")
+    previous = snapshot_inputs(tmp_path, ["C-1E_ch"])
+    (tmp_path / "C-1E_ch" / "time_scores19-24_T_2M.dat").write_text("new data")
+    (tmp_path / "C-1E_ch" / "time_scores07-12_TD_2M.dat").write_text("data")
+    changed = changed_inputs(previous, snapshot_inputs(tmp_path, ["C-1E_ch"]))
+    assert changed == [
+        "C-1E_ch/time_scores07-12_TD_2M.dat",
+        "C-1E_ch/time_scores19-24_T_2M.dat",
+    ]
+
+    plan = [
+        {"data_key": "T_2M", "inputs": ["C-1E_ch/time_scores07-12_T_2M.dat"]},
+        {"data_key": "T_2M", "inputs": ["C-1E_ch/time_scores19-24_T_2M.dat"]},
+        {"data_key": "FF_10M", "inputs": ["C-1E_ch/time_scores07-12_FF_10M.dat"]},
+    ]
+    assert affected_figures(plan, changed) == plan[:2]
+
+
+def test_failed_render_keeps_watching_and_retries(tmp_path, monkeypatch, capsys):
+    (tmp_path / "C-1E_ch").mkdir()
+    sleeps = []
+
+    def _sleep(_seconds):
+        # the input file is written (header only) during the first interval
+        if not sleeps:
+            (tmp_path / "C-1E_ch" / "time_scores07-12_T_2M.dat").write_text(
+                "Parameter: T_2M\nMissing_value: -999\nScore Station1 Station2\n"
+            )
+        sleeps.append(_seconds)
+        if len(sleeps) > 3:
+            raise KeyboardInterrupt
+
+    renders = []
+
+    def _render_changed(changed):
+        renders.append(changed)
+        load_input_files(tmp_path, changed)
+
+    monkeypatch.setattr(watch.time, "sleep", _sleep)
+    watch.watch_inputs(_render_changed, tmp_path, ["C-1E_ch"], poll_seconds=0)
+    # each scan retries the file which failed to render
+    assert renders == [["C-1E_ch/time_scores07-12_T_2M.dat"]] * 3
+    assert "Atab file is empty" in capsys.readouterr().err
@@ -0,0 +1,87 @@
+"""Test the work queue shared by several worker processes."""
+import multiprocessing
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from moveroplot.work_queue import claim
+from moveroplot.work_queue import job_id
+from moveroplot.work_queue import run_worker
+
+_PLAN = [{"output": f"figure_{idx}.png"} for idx in range(20)]
+
+
+def _render(spec, output_dir):
+    # log every rendering (next to out/plots/<render dir>), to check that no
+    # figure is rendered twice
+    with open(Path(output_dir).parents[2] / "log", "a") as log:
+        log.write(spec["output"] + "\n")
+    (Path(output_dir) / spec["output"]).write_text(spec["output"])
+
+
+def _worker(queue_dir, output_dir):
+    run_worker(_PLAN, queue_dir, output_dir, _render, workers=2, poll_seconds=0.1)
+
+
+def test_figures_rendered_once_by_several_processes(tmp_path):
+    queue_dir, output_dir = tmp_path / "queue", tmp_path / "out" / "plots"
+    output_dir.mkdir(parents=True)
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_worker, args=(queue_dir, output_dir)) for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+    rendered = (tmp_path / "log").read_text().split()
+    assert sorted(rendered) == sorted(spec["output"] for spec in _PLAN)
+    assert sorted(os.listdir(output_dir)) == sorted(rendered)
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue_dir, output_dir = tmp_path / "queue", tmp_path / "out" / "plots"
+    output_dir.mkdir(parents=True)
+    (queue_dir / "leases").mkdir(parents=True)
+    # a crashed worker left the leases of two figures behind
+    crashed = [claim(queue_dir, job_id(spec)) for spec in _PLAN[:2]]
+    os.utime(crashed[0], (time.time() - 60, time.time() - 60))
+    assert claim(queue_dir, job_id(_PLAN[1]), lease_seconds=30) is None
+
+    published = run_worker(_PLAN[:1], queue_dir, output_dir, _render, lease_seconds=30)
+    assert published == 1
+    assert os.listdir(output_dir) == ["figure_0.png"]
+
+
+def test_job_without_figure_is_done(tmp_path):
+    queue_dir, output_dir = tmp_path / "queue", tmp_path / "out" / "plots"
+    output_dir.mkdir(parents=True)
+    plan = _PLAN[:2] + [{"output": "no_data.png"}]
+
+    def _render_valid(spec, render_dir):
+        # like _render_figure, no figure is saved without valid data
+        if spec["output"] != "no_data.png":
+            _render(spec, render_dir)
+
+    published = run_worker(plan, queue_dir, output_dir, _render_valid, workers=2)
+    assert published == 2
+    assert sorted(os.listdir(output_dir)) == ["figure_0.png", "figure_1.png"]
+    assert (queue_dir / "done" / job_id(plan[2])).exists()
+
+
+def test_failed_render_releases_lease(tmp_path):
+    queue_dir, output_dir = tmp_path / "queue", tmp_path / "out" / "plots"
+    output_dir.mkdir(parents=True)
+
+    def _fail(spec, render_dir):
+        raise RuntimeError(spec["output"])
+
+    with pytest.raises(RuntimeError):
+        run_worker(_PLAN[:1], queue_dir, output_dir, _fail)
+    # the job is reclaimed right away, not after the lease expired
+    published = run_worker(_PLAN[:1], queue_dir, output_dir, _render)
+    assert published == 1
+    assert os.listdir(output_dir) == ["figure_0.png"]